@@ -1,28 +1,71 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+import hashlib
+from typing import Union
 
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.etag import etag_matches
 from app.user.schemas import UserCreate, UserResponse
 
-from .schemas import LoginRequest, TokenResponse
+from .schemas import JWKSet, LoginRequest, RefreshRequest, TokenResponse
 from .service import AuthService
 
 router = APIRouter()
+# Served at the root rather than under /auth
+well_known_router = APIRouter()
 
 
 @router.post(
     "/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
+async def signup(
+    user_data: UserCreate, db: AsyncSession = Depends(get_db)
+) -> UserResponse:
     """Register a new user"""
-    user = AuthService.register_user(db, user_data)
+    user = await AuthService.register_user(db, user_data)
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
-    login_data: LoginRequest, db: Session = Depends(get_db)
+    login_data: LoginRequest, db: AsyncSession = Depends(get_db)
 ) -> TokenResponse:
     """Login user and return JWT token"""
-    token_response = AuthService.authenticate_user(db, login_data)
+    token_response = await AuthService.authenticate_user(db, login_data)
     return token_response
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    refresh_data: RefreshRequest, db: AsyncSession = Depends(get_db)
+) -> TokenResponse:
+    """Exchange a refresh token for new tokens, without a password check"""
+    return await AuthService.refresh_tokens(db, refresh_data.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_data: RefreshRequest, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Revoke the session of a refresh token and its access tokens"""
+    await AuthService.logout(db, refresh_data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@well_known_router.get("/.well-known/jwks.json", response_model=JWKSet)
+async def get_jwks(request: Request, response: Response) -> Union[JWKSet, Response]:
+    """Public signing keys, for validating tokens without calling this API"""
+    jwks = AuthService.get_jwks()
+
+    etag = '"%s"' % hashlib.sha256(jwks.model_dump_json().encode()).hexdigest()[:32]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=%d" % settings.JWKS_CACHE_SECONDS,
+    }
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return jwks
@@ -1,50 +1,105 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import verify_token
+from app.user.cache import user_cache
 from app.user.model import User
 from app.user.service import UserService
 
+from .principal import Principal
+from .revocation import revoked_tokens
+
 security = HTTPBearer()
 
 
-def get_current_user(
+def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user"""
+) -> dict:
+    """Decode the bearer token and return its claims"""
     token = credentials.credentials
     payload = verify_token(token)
 
-    if payload is None:
+    if payload is None or payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    username: str = payload.get("sub")
-    if username is None:
+    if revoked_tokens.is_revoked(payload.get("jti")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = UserService.get_user_by_username(db, username)
+    return payload
+
+
+def _require_active(principal: Principal) -> Principal:
+    """Rules every authenticated caller must pass, whichever way it was
+    resolved"""
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return principal
+
+
+async def _load_user(payload: dict, db: AsyncSession) -> User:
+    user = await UserService.get_user_by_username(db, payload["sub"])
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return user
+
 
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Get the current user's full row, for routes that need more than the
+    principal. The same checks as for ``get_current_principal`` apply."""
+    user = await _load_user(payload, db)
+    _require_active(Principal.from_user(user))
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_principal(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Get the identity of the current user.
+
+    With ``AUTH_STATELESS`` enabled the identity is taken from the signed
+    token claims and no query is issued; role changes then apply once the
+    token is reissued. Otherwise the user is looked up in the user cache
+    and loaded from the database on a miss.
+    """
+    if settings.AUTH_STATELESS:
+        principal = Principal.from_claims(payload)
+        if principal is not None:
+            return principal
+
+    user_id = payload.get("user_id")
+    principal = user_cache.get(user_id) if user_id is not None else None
+    if principal is None:
+        user = await _load_user(payload, db)
+        principal = Principal.from_user(user)
+        user_cache.set(principal.id, principal)
+
+    return _require_active(principal)
+
+
+def require_admin(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """Require admin role"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    """Issued refresh token, stored only as its SHA-256 digest.
+
+    Every login starts a family; each refresh marks the presented token used
+    and adds its successor to the family. Presenting a used token again
+    revokes the whole family.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    family_id = Column(String(32), nullable=False, index=True)
+    jti = Column(String(32), nullable=False)  # access token issued alongside
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Revocation list rebuilds read recently revoked tokens only
+        Index("ix_refresh_tokens_revoked_at", "revoked_at"),
+    )
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from app.user.model import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller identity, without the rest of the user row"""
+
+    id: int
+    username: str
+    role: str
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a loaded user row"""
+        return cls(
+            id=int(user.id),
+            username=str(user.username),
+            role=str(user.role),
+            is_active=bool(user.is_active),
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """Build a principal from signed token claims, if they are complete"""
+        user_id = payload.get("user_id")
+        username = payload.get("sub")
+        role = payload.get("role")
+        if user_id is None or username is None or role is None:
+            return None
+        return cls(id=user_id, username=username, role=role)
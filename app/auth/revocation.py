@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, Iterable, Optional, Set, cast
+
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+from .model import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """``jti`` claims of access tokens whose session was revoked.
+
+    Only tokens issued within the access token lifetime can still be valid,
+    so the set stays small and a plain set answers exactly, with no false
+    positives. Revocations made by this worker apply at once; those made by
+    other workers once the set is next rebuilt from the table.
+    """
+
+    def __init__(self):
+        self._revoked: Set[str] = set()
+        # Revocations made while a rebuild is reading the table; they may
+        # be missing from its snapshot
+        self._added_during_rebuild: Optional[Set[str]] = None
+        self.rebuilt_at: Optional[datetime] = None
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def add(self, jtis: Iterable[str]) -> None:
+        jtis = set(jtis)
+        self._revoked.update(jtis)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.update(jtis)
+
+    def clear(self) -> None:
+        self._revoked = set()
+        self.rebuilt_at = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Replace the set with the revoked tokens that have not expired"""
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        self._added_during_rebuild = set()
+        try:
+            result = await db.scalars(
+                select(RefreshToken.jti).where(
+                    RefreshToken.revoked_at >= cutoff,
+                    RefreshToken.created_at >= cutoff,
+                )
+            )
+            self._revoked = set(result) | self._added_during_rebuild
+        finally:
+            self._added_during_rebuild = None
+        self.rebuilt_at = now
+
+
+revoked_tokens = RevocationList()
+
+
+async def purge_expired_refresh_tokens(db: AsyncSession) -> int:
+    """Delete refresh tokens past their expiry"""
+    expired = delete(RefreshToken).where(
+        RefreshToken.expires_at < datetime.now(timezone.utc)
+    )
+    result = cast(CursorResult, await db.execute(expired))
+    await db.commit()
+    return result.rowcount
+
+
+async def maintain_revocations(
+    interval: float,
+    session_factory: Callable[
+        [], AsyncContextManager[AsyncSession]
+    ] = AsyncSessionLocal,
+) -> None:
+    """Rebuild the revocation list every ``interval`` seconds until cancelled,
+    and delete expired refresh tokens"""
+    while True:
+        try:
+            async with session_factory() as db:
+                await revoked_tokens.rebuild(db)
+                await purge_expired_refresh_tokens(db)
+        except Exception:
+            logger.exception("Rebuilding the token revocation list failed")
+        await asyncio.sleep(interval)
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -6,6 +8,16 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
+    expires_in: Optional[int] = None  # access token lifetime in seconds
+    refresh_token: Optional[str] = None
+
+
+class JWKSet(BaseModel):
+    keys: List[dict]  # public JWKs (RFC 7517) of every accepted signing key
@@ -1,46 +1,89 @@
-from datetime import timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, cast
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import CursorResult, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.hashing import HashingQueueFull, verify_password
+from app.core.keys import get_key_set
+from app.core.security import (
+    create_access_token,
+    generate_refresh_token,
+    hash_refresh_token,
+)
+from app.user.cache import user_cache
 from app.user.model import User
 from app.user.schemas import UserCreate
 from app.user.service import UserService
 
-from .schemas import LoginRequest, TokenResponse
+from .model import RefreshToken
+from .principal import Principal
+from .revocation import revoked_tokens
+from .schemas import JWKSet, LoginRequest, TokenResponse
 
 
 class AuthService:
 
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> User:
-        """Register a new user"""
-        # Check if user already exists
-        if UserService.get_user_by_username(db, user_data.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered",
-            )
+    def _busy() -> HTTPException:
+        """Error returned when the password hashing pool is saturated"""
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
 
-        if UserService.get_user_by_email(db, user_data.email):
+    @staticmethod
+    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """Register a new user"""
+        # One INSERT; the unique indexes on username/email reject duplicates,
+        # which also holds for concurrent signups
+        try:
+            user = await UserService.create_user(db, user_data)
+        except HashingQueueFull:
+            raise AuthService._busy()
+        except IntegrityError as exc:
+            await db.rollback()
+            field = AuthService._duplicate_field(exc)
+            if field is None:
+                raise
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
+                detail=f"{field.capitalize()} already registered",
             )
-
-        # Create user
-        user = UserService.create_user(db, user_data)
         return user
 
     @staticmethod
-    def authenticate_user(db: Session, login_data: LoginRequest) -> TokenResponse:
+    def _duplicate_field(exc: IntegrityError) -> Optional[str]:
+        """Which unique user field a failed INSERT collided on, if any"""
+        # Only the first line names the constraint; PostgreSQL's DETAIL line
+        # echoes the submitted values, which may contain either word
+        message = str(exc.orig).splitlines()[0].lower()
+        for field in ("username", "email"):
+            if field in message:
+                return field
+        return None
+
+    @staticmethod
+    async def authenticate_user(
+        db: AsyncSession, login_data: LoginRequest
+    ) -> TokenResponse:
         """Authenticate user and return JWT token"""
         # Get user by username
-        user = UserService.get_user_by_username(db, login_data.username)
+        user = await UserService.get_user_by_username(db, login_data.username)
 
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        try:
+            password_ok = user is not None and await verify_password(
+                login_data.password, user.hashed_password
+            )
+        except HashingQueueFull:
+            raise AuthService._busy()
+
+        if user is None or not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -52,11 +95,134 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
             )
 
-        # Create access token
+        return await AuthService._issue_tokens(db, Principal.from_user(user))
+
+    @staticmethod
+    async def _issue_tokens(
+        db: AsyncSession, principal: Principal, family_id: Optional[str] = None
+    ) -> TokenResponse:
+        """Create an access token and a refresh token in the given family,
+        or in a new one"""
+        now = datetime.now(timezone.utc)
+        jti = uuid.uuid4().hex
+        family_id = family_id or uuid.uuid4().hex
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.username, "user_id": user.id, "role": user.role},
+            data={
+                "sub": principal.username,
+                "user_id": principal.id,
+                "role": principal.role,
+                "jti": jti,
+                "sid": family_id,
+            },
             expires_delta=access_token_expires,
         )
 
-        return TokenResponse(access_token=access_token, token_type="bearer")
+        refresh_token = generate_refresh_token()
+        await db.execute(
+            insert(RefreshToken).values(
+                token_hash=hash_refresh_token(refresh_token),
+                user_id=principal.id,
+                family_id=family_id,
+                jti=jti,
+                created_at=now,
+                expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        await db.commit()
+
+        return TokenResponse(
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=int(access_token_expires.total_seconds()),
+            refresh_token=refresh_token,
+        )
+
+    @staticmethod
+    def _invalid_refresh_token() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    @staticmethod
+    async def refresh_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
+        """Exchange a refresh token for a new access token and refresh token"""
+        now = datetime.now(timezone.utc)
+        stored = (
+            await db.execute(
+                select(
+                    RefreshToken.id,
+                    RefreshToken.user_id,
+                    RefreshToken.family_id,
+                    RefreshToken.revoked_at,
+                ).where(
+                    RefreshToken.token_hash == hash_refresh_token(refresh_token),
+                    RefreshToken.expires_at > now,
+                )
+            )
+        ).one_or_none()
+        if stored is None or stored.revoked_at is not None:
+            raise AuthService._invalid_refresh_token()
+
+        # Of concurrent or repeated uses of one token only the first succeeds
+        claim = (
+            update(RefreshToken)
+            .where(RefreshToken.id == stored.id, RefreshToken.used_at.is_(None))
+            .values(used_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = cast(CursorResult, await db.execute(claim))
+        if claimed.rowcount == 0:
+            # A rotated-out token came back, so it has leaked: end the session
+            await AuthService._revoke_family(db, stored.family_id)
+            raise AuthService._invalid_refresh_token()
+
+        principal = user_cache.get(stored.user_id)
+        if principal is None:
+            user = await UserService.get_user_by_id(db, stored.user_id)
+            if user is None:
+                raise AuthService._invalid_refresh_token()
+            principal = Principal.from_user(user)
+            user_cache.set(principal.id, principal)
+
+        if not principal.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+            )
+
+        return await AuthService._issue_tokens(db, principal, stored.family_id)
+
+    @staticmethod
+    async def logout(db: AsyncSession, refresh_token: str) -> None:
+        """Revoke the session a refresh token belongs to"""
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(refresh_token)
+            )
+        )
+        if family_id is not None:
+            await AuthService._revoke_family(db, family_id)
+
+    @staticmethod
+    async def _revoke_family(db: AsyncSession, family_id: str) -> None:
+        """Revoke every refresh token of a session and the access tokens
+        issued with them"""
+        jtis = await db.scalars(
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+            .returning(RefreshToken.jti)
+        )
+        revoked = list(jtis)
+        await db.commit()
+        revoked_tokens.add(revoked)
+
+    @staticmethod
+    def get_jwks() -> JWKSet:
+        """Public keys that verify this service's tokens (none with HS256)"""
+        key_set = get_key_set()
+        return JWKSet(keys=key_set.jwks()["keys"] if key_set else [])
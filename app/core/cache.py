@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Every named cache, so operational endpoints can report on all of them
+caches: Dict[str, Union["TTLCache", "RefreshingValue"]] = {}
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is
+    reached. A ``maxsize`` of 0 disables the cache: lookups always miss and
+    nothing is stored. Safe to share between threads.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally with a shorter time-to-live"""
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Current size and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RefreshingValue:
+    """Single cached value refreshed with stale-while-revalidate semantics.
+
+    A value younger than ``ttl`` is served as is. Up to ``stale_ttl``
+    seconds past that it is still served, while one background load
+    replaces it. Older or missing values are loaded inline, and concurrent
+    callers share that single load. A ``ttl`` of 0 disables caching.
+
+    The loader must not depend on the caller's request scope (e.g. its
+    database session), since it may outlive the request that started it.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Future] = None
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+        caches[name] = self
+
+    async def get(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, loading or refreshing it as needed"""
+        if self.ttl <= 0:
+            self.misses += 1
+            return await loader()
+
+        if self._loaded_at is not None:
+            age = time.monotonic() - self._loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return self._value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._start_load(loader)
+                return self._value
+
+        self.misses += 1
+        return await asyncio.shield(self._start_load(loader))
+
+    def _start_load(self, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._load(loader, self._generation))
+            self._task.add_done_callback(self._load_done)
+        return self._task
+
+    async def _load(self, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await loader()
+            # A load started before an invalidation may predate the write
+            # that caused it; hand it to its waiters but do not keep it.
+            if generation == self._generation:
+                self._value = value
+                self._loaded_at = time.monotonic()
+            return value
+        finally:
+            if generation == self._generation:
+                self._task = None
+
+    def _load_done(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+            logger.warning(
+                "Refreshing cached value %r failed",
+                self.name,
+                exc_info=task.exception(),
+            )
+
+    def clear(self) -> None:
+        """Drop the value so the next caller loads a fresh one"""
+        self._generation += 1
+        self._value = None
+        self._loaded_at = None
+        self._task = None
+
+    def stats(self) -> dict:
+        """Current size and hit/miss counters"""
+        hits = self.hits + self.stale_hits
+        lookups = hits + self.misses
+        return {
+            "name": self.name,
+            "size": 0 if self._loaded_at is None else 1,
+            "maxsize": 1,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": self.misses,
+            "evictions": 0,
+            "expirations": self.stale_hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def clear_caches() -> None:
+    """Drop the contents of every named cache"""
+    for cache in caches.values():
+        cache.clear()
@@ -0,0 +1,25 @@
+import re
+
+# An entity tag, optionally weak: W/"..." or "..."
+_ENTITY_TAG = re.compile(r'(?:\s*,)*\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag``.
+
+    The header is ``*`` or a comma-separated list of entity tags; tags are
+    compared exactly, ignoring the weak ``W/`` prefix as the weak comparison
+    of RFC 9110 requires. A malformed list matches nothing.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    pos = 0
+    while pos < len(if_none_match):
+        match = _ENTITY_TAG.match(if_none_match, pos)
+        if match is None:
+            return False
+        if match.group(1) == opaque:
+            return True
+        pos = match.end()
+    return False
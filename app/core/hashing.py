@@ -0,0 +1,87 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import settings
+from .metrics import password_hash_duration
+from .security import get_password_hash as _hash_password_sync
+from .security import verify_password as _verify_password_sync
+
+T = TypeVar("T")
+
+
+class HashingQueueFull(Exception):
+    """Raised when the hashing executor cannot accept more work"""
+
+
+class HashingExecutor:
+    """Bounded process pool for bcrypt hashing and verification.
+
+    bcrypt is pure CPU work, so running it inside an ``async def`` handler
+    blocks the event loop for every other request on the worker. Jobs are
+    sent to a process pool instead; ``queue_depth`` caps how many jobs may
+    be running or waiting at once so a login storm is rejected early
+    instead of piling up unbounded.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, queue_depth: int = 64):
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.pool_size)
+        return self._pool
+
+    async def _submit(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.queue_depth:
+            raise HashingQueueFull("Password hashing queue is full")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently running or waiting in the pool"""
+        return self._pending
+
+    async def hash_password(self, password: str) -> str:
+        """Generate hash for a password without blocking the event loop"""
+        with password_hash_duration.time(operation="hash"):
+            return await self._submit(_hash_password_sync, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash without blocking the event loop"""
+        with password_hash_duration.time(operation="verify"):
+            return await self._submit(
+                _verify_password_sync, plain_password, hashed_password
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+hashing_executor = HashingExecutor(
+    pool_size=settings.HASHING_POOL_SIZE,
+    queue_depth=settings.HASHING_QUEUE_DEPTH,
+)
+
+
+async def hash_password(password: str) -> str:
+    """Generate hash for a password in the hashing pool"""
+    return await hashing_executor.hash_password(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against its hash in the hashing pool"""
+    return await hashing_executor.verify_password(plain_password, hashed_password)
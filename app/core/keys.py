@@ -0,0 +1,106 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from .config import settings
+
+# Signature algorithm for each key type and curve
+CURVE_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """One key of the key set, identified by the ``kid`` token header"""
+
+    kid: str
+    algorithm: str
+    verifying_key: Key
+    signing_key: Optional[Key] = None  # None for verify-only (retired) keys
+
+    def public_jwk(self) -> dict:
+        """Public half of the key as a JWK, for the JWKS document"""
+        return {
+            **self.verifying_key.to_dict(),
+            "kid": self.kid,
+            "use": "sig",
+            "alg": self.algorithm,
+        }
+
+
+class KeySet:
+    """Keys accepted for token verification and the one used for signing"""
+
+    def __init__(self, keys: Dict[str, SigningKey], active_kid: str):
+        self.keys = keys
+        self.active = keys[active_kid]
+
+    def jwks(self) -> dict:
+        return {"keys": [key.public_jwk() for key in self.keys.values()]}
+
+
+def _algorithm(pem: bytes) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+
+    if b"PRIVATE KEY" in pem:
+        key = load_pem_private_key(pem, password=None).public_key()
+    else:
+        key = load_pem_public_key(pem)
+    if isinstance(key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(key, ec.EllipticCurvePublicKey):
+        if key.curve.name in CURVE_ALGORITHMS:
+            return CURVE_ALGORITHMS[key.curve.name]
+    raise ValueError("Signing keys must be RSA or NIST P-256/384/521 EC keys")
+
+
+def load_key_set(directory: str, active_kid: Optional[str] = None) -> KeySet:
+    """Load ``<kid>.pem`` files from ``directory``.
+
+    Private keys can sign and verify; public keys only verify, which keeps a
+    retired key valid for the tokens it already signed. Without
+    ``active_kid`` the directory must hold exactly one private key.
+    """
+    keys = {}
+    for name in sorted(os.listdir(directory)):
+        kid, ext = os.path.splitext(name)
+        if ext != ".pem":
+            continue
+        with open(os.path.join(directory, name), "rb") as f:
+            pem = f.read()
+        algorithm = _algorithm(pem)
+        key = jwk.construct(pem, algorithm)
+        private = b"PRIVATE KEY" in pem
+        keys[kid] = SigningKey(
+            kid=kid,
+            algorithm=algorithm,
+            verifying_key=key.public_key() if private else key,
+            signing_key=key if private else None,
+        )
+
+    if active_kid is None:
+        private_kids = [kid for kid, key in keys.items() if key.signing_key]
+        if len(private_kids) != 1:
+            raise ValueError(
+                f"{directory} holds {len(private_kids)} private keys; "
+                "set JWT_ACTIVE_KID to choose the signing key"
+            )
+        active_kid = private_kids[0]
+    if active_kid not in keys or keys[active_kid].signing_key is None:
+        raise ValueError(f"No private key {active_kid}.pem in {directory}")
+    return KeySet(keys, active_kid)
+
+
+@lru_cache(maxsize=None)
+def get_key_set() -> Optional[KeySet]:
+    """Key set from ``JWT_KEYS_DIR``, or None to sign with ``SECRET_KEY``"""
+    if not settings.JWT_KEYS_DIR:
+        return None
+    return load_key_set(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
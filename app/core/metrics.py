@@ -0,0 +1,325 @@
+import asyncio
+import bisect
+import glob
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Metric:
+    """Base class for metrics kept in process memory"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # A float, or a histogram's [bucket counts, sum, count]
+        self._values: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: object) -> None:
+        """Mirror a count that is already kept cumulatively elsewhere"""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket (not cumulative) counts, then sum and count
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return [list(value[0]), value[1], value[2]]
+
+
+class MetricsRegistry:
+    """All metrics of this process, plus collectors that refresh them"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> None:
+        self.metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every snapshot to update mirrored values"""
+        self.collectors.append(collector)
+
+    def snapshot(self, alive: bool = True) -> dict:
+        """JSON-serialisable copy of every metric.
+
+        A snapshot of a worker that has exited keeps its counters and
+        histograms, so totals do not drop, but not its gauges.
+        """
+        for collector in self.collectors:
+            collector()
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labels": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", [])),
+                "samples": [
+                    [list(key), value]
+                    for key, value in metric.samples().items()
+                    if alive or metric.type != "gauge"
+                ],
+            }
+            for name, metric in self.metrics.items()
+        }
+
+    def write_snapshot(self, directory: str, alive: bool = True) -> None:
+        """Publish this worker's metrics for the other workers to aggregate"""
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(alive=alive), f)
+        os.replace(tmp_path, path)
+
+    def render(self, directory: Optional[str] = None) -> str:
+        """Prometheus text exposition of this worker, or of every worker
+        that published a snapshot in ``directory``"""
+        if directory is None:
+            return render_text(self.snapshot())
+
+        self.write_snapshot(directory)
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # removed or replaced while listing
+        return render_text(merge_snapshots(snapshots))
+
+    def clear(self) -> None:
+        for metric in self.metrics.values():
+            metric.clear()
+
+
+def merge_snapshots(snapshots: List[dict]) -> dict:
+    """Sum the samples of several workers' snapshots"""
+    merged: dict = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            for key, value in metric["samples"]:
+                key = tuple(key)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif metric["type"] == "histogram":
+                    target["samples"][key] = [
+                        [a + b for a, b in zip(current[0], value[0])],
+                        current[1] + value[1],
+                        current[2] + value[2],
+                    ]
+                else:
+                    target["samples"][key] = current + value
+    for metric in merged.values():
+        metric["samples"] = list(metric["samples"].items())
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_text(snapshot: dict) -> str:
+    """Format a snapshot in the Prometheus text exposition format"""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labels"]
+        for key, value in sorted(metric["samples"], key=lambda sample: sample[0]):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(labelnames, key)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(metric["buckets"], counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{name}_bucket{_labels(labelnames, key, le)} {cumulative}"
+                )
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_labels(labelnames, key, le)} {count}")
+            lines.append(f"{name}_sum{_labels(labelnames, key)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labelnames, key)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+async def publish_snapshots(directory: str, interval: float) -> None:
+    """Write this worker's snapshot every ``interval`` seconds until cancelled"""
+    os.makedirs(directory, exist_ok=True)
+    try:
+        while True:
+            registry.write_snapshot(directory)
+            await asyncio.sleep(interval)
+    finally:
+        registry.write_snapshot(directory, alive=False)
+
+
+registry = MetricsRegistry()
+
+# Application metrics, recorded where the work happens
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served"
+)
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify time, including waiting for a hashing process",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+jwt_decode_duration = Histogram(
+    "jwt_decode_duration_seconds",
+    "JWT signature verification time (token cache misses only)",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+# Mirrored from the connection pool and caches when a snapshot is taken
+db_pool_connections = Gauge(
+    "db_pool_connections", "Pooled database connections by state", ["state"]
+)
+db_pool_checkouts = Counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool"
+)
+db_pool_timeouts = Counter(
+    "db_pool_timeouts_total", "Requests that gave up waiting for a connection"
+)
+db_pool_wait = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a pooled connection"
+)
+cache_hits = Counter("cache_hits_total", "In-process cache hits", ["cache"])
+cache_misses = Counter("cache_misses_total", "In-process cache misses", ["cache"])
+cache_evictions = Counter(
+    "cache_evictions_total", "Entries evicted to stay within size", ["cache"]
+)
+cache_entries = Gauge("cache_entries", "Entries held by each cache", ["cache"])
@@ -0,0 +1,120 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import http_request_duration, http_requests, http_requests_in_progress
+from .queries import QueryStats, query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Report the SQL statements and database time spent on each request.
+
+    The totals are logged when the request finishes and, with
+    ``server_timing``, sent in a ``Server-Timing`` header. Statements a
+    streaming response issues after its headers are sent are only in the
+    log line.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    db_ms = stats.total_seconds * 1000
+                    app_ms = (time.perf_counter() - start) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={db_ms:.2f};desc="{stats.count} queries", '
+                        f"app;dur={app_ms:.2f}",
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            logger.info(
+                "%s %s %d %.1fms queries=%d db=%.1fms slowest=%.1fms %s",
+                scope["method"],
+                scope["path"],
+                status_code,
+                (time.perf_counter() - start) * 1000,
+                stats.count,
+                stats.total_seconds * 1000,
+                stats.slowest_seconds * 1000,
+                " ".join((stats.slowest_statement or "-").split())[:200],
+            )
+
+
+def route_template(scope: Scope) -> str:
+    """Path of the matched route with its parameters as ``{name}``"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = str(getattr(route, "path_format", route.path))
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return template
+    # A route of an included router may only know its path below the
+    # router's prefix; the prefix is the part of the request path in front
+    # of the segments that route matches
+    path: str = scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and regex.fullmatch(path[i:]):
+            return path[:i] + template
+    return template
+
+
+class MetricsMiddleware:
+    """Count requests and record their latency per route template.
+
+    Routes are labelled by their path template (``/user/{user_id}``), and
+    requests that match no route share the ``unmatched`` label, so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method=method, route=route, status=status_code)
+            http_request_duration.observe(elapsed, method=method, route=route)
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    """Build an opaque cursor pointing just past the given sort key"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, int]]:
+    """Read a cursor produced by encode_cursor, or None if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        return None
+    return value, row_id
+
+
+def keyset_after(
+    column: ColumnElement,
+    id_column: ColumnElement,
+    cursor: str,
+    descending: bool = False,
+) -> Optional[ColumnElement]:
+    """Condition selecting the rows that follow the cursor in (column, id) order.
+
+    The sort key is read back from the cursor's row by primary key, so the
+    comparison uses the exact stored value rather than a round-tripped
+    copy; the value carried in the cursor is only used if that row is gone.
+    Returns None if the cursor is malformed.
+    """
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+
+    value, row_id = position
+    python_type = column.type.python_type
+    if isinstance(value, str) and python_type is datetime:
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value is not None and not isinstance(value, python_type):
+        return None
+
+    stored = select(column).where(id_column == row_id).correlate(None).scalar_subquery()
+    key = tuple_(
+        func.coalesce(stored, literal(value, type_=column.type)), literal(row_id)
+    )
+    if descending:
+        return tuple_(column, id_column) < key
+    return tuple_(column, id_column) > key
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+
+class PoolStats:
+    """Counters describing how connections are acquired from the pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.overflow_peak = 0
+
+    def record_checkout(self, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_peak = max(self.overflow_peak, overflow)
+
+    def record_wait(self, waited: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+pool_stats = PoolStats()
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """Pool queue that records how long callers block waiting on it"""
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection.
+
+    Only the wait for a free connection counts: opening new connections,
+    pre-ping round trips and reconnects are not pool waits.
+    """
+
+    _queue_class = _TimedQueue
+
+    def connect(self):
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_checkout(max(self.overflow(), 0))
+        return connection
+
+
+def get_pool_status(pool: Pool) -> dict:
+    """Snapshot of pool occupancy and acquisition timings"""
+    status = {
+        "pool_class": type(pool).__name__,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+        "wait_seconds_avg": (
+            round(pool_stats.wait_seconds_total / pool_stats.checkouts, 6)
+            if pool_stats.checkouts
+            else 0.0
+        ),
+        "overflow_peak": pool_stats.overflow_peak,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return status
+
+
+def connection_budget(workers: int, pool_size: int, max_overflow: int) -> int:
+    """Most connections ``workers`` processes can hold open at once"""
+    return workers * (pool_size + max_overflow)
@@ -0,0 +1,81 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Optional, Union
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+
+# Stats of the request being served. Handlers run their queries through
+# SQLAlchemy's greenlet bridge, which keeps the calling task's context, so
+# engine events see the value set by the middleware.
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Describe bound parameters by type only, so values never reach the logs"""
+    if isinstance(parameters, dict):
+        return "{%s}" % ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in parameters.items()
+        )
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return "(%s)" % ", ".join(type(value).__name__ for value in parameters)
+    return type(parameters).__name__
+
+
+# The start time lives on the statement's execution context rather than the
+# connection: after_cursor_execute does not fire for a statement that
+# raises, and nothing would then remove it from the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s; parameters %s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            parameter_shape(parameters),
+        )
+
+
+def instrument_engine(engine: Union[Engine, AsyncEngine]) -> None:
+    """Time every statement executed through ``engine`` (sync or async)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
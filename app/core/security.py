@@ -1,22 +1,45 @@
+import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
+from .cache import TTLCache
 from .config import settings
+from .keys import get_key_set
+from .metrics import jwt_decode_duration
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded payloads of recently verified tokens, keyed by token digest
+token_cache = TTLCache(
+    "tokens",
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """bcrypt context, built on first use.
+
+    Hashing runs in the hashing worker processes, so the request-serving
+    process never needs to import passlib.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate hash for a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -30,18 +53,71 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         )
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    key_set = get_key_set()
+    token: str
+    if key_set is None:
+        token = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    else:
+        key = key_set.active
+        token = jwt.encode(
+            to_encode,
+            key.signing_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
+    return token
 
 
-def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode JWT token"""
-    try:
+def _decode_token(token: str) -> dict:
+    """Check the token's signature with the key named by its kid header"""
+    key_set = get_key_set()
+    payload: dict
+    if key_set is None:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
+    else:
+        key = key_set.keys.get(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise JWTError("Unknown signing key")
+        payload = jwt.decode(token, key.verifying_key, algorithms=[key.algorithm])
+    return payload
+
+
+def generate_refresh_token() -> str:
+    """Random opaque refresh token"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Digest under which a refresh token is stored.
+
+    Refresh tokens are 256 random bits, so a fast hash is enough; bcrypt
+    would only make every renewal as expensive as a login.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def verify_token(token: str) -> Optional[dict]:
+    """Verify and decode JWT token.
+
+    Successfully decoded payloads are cached until the token's ``exp`` so
+    clients reusing a token skip signature verification on later calls.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return dict(payload)
+        token_cache.invalidate(key)
+
+    try:
+        with jwt_decode_duration.time():
+            payload = _decode_token(token)
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, dict(payload), ttl=exp - time.time())
+    return payload
@@ -0,0 +1,11 @@
+from app.core.cache import RefreshingValue
+from app.core.config import settings
+
+# Latest feedback summary. Writes do not clear it, so a burst of feedback
+# does not turn every summary request into a query; new feedback shows up
+# once the TTL runs out, after at most the TTL plus the stale window.
+summary_cache = RefreshingValue(
+    "feedback_summary",
+    ttl=settings.SUMMARY_CACHE_TTL_SECONDS,
+    stale_ttl=settings.SUMMARY_CACHE_STALE_SECONDS,
+)
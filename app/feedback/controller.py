@@ -1,45 +1,136 @@
-from typing import List
+import hashlib
+from typing import List, Optional, Sequence, Union
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user, require_admin
+from app.auth.dependencies import get_current_principal, require_admin
+from app.auth.principal import Principal
+from app.core.config import settings
 from app.core.database import get_db
-from app.user.model import User
+from app.core.etag import etag_matches
 
-from .schemas import FeedbackCreate, FeedbackResponse, FeedbackSummary, FeedbackWithUser
+from .schemas import (
+    ExportFormat,
+    FeedbackAccepted,
+    FeedbackBatch,
+    FeedbackCreate,
+    FeedbackFilter,
+    FeedbackResponse,
+    FeedbackSort,
+    FeedbackSummary,
+    FeedbackWithUser,
+)
 from .service import FeedbackService
+from .writer import feedback_writer
 
 router = APIRouter()
 
 
 @router.post(
-    "/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED
+    "/feedback",
+    response_model=Union[FeedbackResponse, FeedbackAccepted],
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": FeedbackAccepted}},
 )
 async def submit_feedback(
     feedback_data: FeedbackCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> FeedbackResponse:
-    """Submit feedback (User access required)"""
-    feedback = FeedbackService.create_feedback(db, feedback_data, current_user.id)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Union[FeedbackResponse, FeedbackAccepted]:
+    """Submit feedback (User access required)
+
+    In write-behind mode the feedback is queued and 202 is returned with
+    an ``ingest_id`` instead of the stored entry. The id only correlates
+    the request with the writer's logs; it is not stored with the row.
+    """
+    if settings.FEEDBACK_WRITE_BEHIND:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return feedback_writer.submit(feedback_data, current_user.id)
+
+    feedback = await FeedbackService.create_feedback(db, feedback_data, current_user.id)
     return feedback
 
 
+@router.post(
+    "/feedback/batch",
+    response_model=List[FeedbackResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def submit_feedback_batch(
+    feedback_items: FeedbackBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Sequence[FeedbackResponse]:
+    """Submit several feedback entries at once (User access required)
+
+    Items are validated together and stored in one transaction; the
+    response lists the created entries in request order.
+    """
+    feedback_list = await FeedbackService.create_feedback_batch(
+        db, feedback_items, current_user.id
+    )
+    return feedback_list
+
+
 @router.get("/admin/feedback", response_model=List[FeedbackWithUser])
 async def get_all_feedback(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    cursor: Optional[str] = None,
+    sort: FeedbackSort = FeedbackSort.CREATED_AT,
+    filters: FeedbackFilter = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
 ) -> List[FeedbackWithUser]:
-    """Get all feedback (Admin only)"""
-    feedback_list = FeedbackService.get_all_feedback(db, skip=skip, limit=limit)
+    """Get all feedback, optionally filtered and sorted (Admin only)
+
+    The next page's cursor is returned in the ``X-Next-Cursor`` header.
+    """
+    feedback_list, next_cursor = await FeedbackService.get_all_feedback(
+        db, skip=skip, limit=limit, cursor=cursor, filters=filters, sort=sort
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return feedback_list
 
 
+@router.get("/admin/feedback/export")
+async def export_feedback(
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: FeedbackFilter = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+) -> StreamingResponse:
+    """Stream all feedback as NDJSON or CSV (Admin only)"""
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        FeedbackService.export_feedback(db, format, filters),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="feedback.{format.value}"'
+        },
+    )
+
+
 @router.get("/feedback/summary", response_model=FeedbackSummary)
-async def get_feedback_summary(db: Session = Depends(get_db)) -> FeedbackSummary:
+async def get_feedback_summary(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+) -> Union[FeedbackSummary, Response]:
     """Get feedback summary (Public access)"""
-    summary = FeedbackService.get_feedback_summary(db)
+    summary = await FeedbackService.get_cached_feedback_summary(db)
+
+    etag = '"%s"' % hashlib.sha256(summary.model_dump_json().encode()).hexdigest()[:32]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=%d, stale-while-revalidate=%d"
+        % (settings.SUMMARY_CACHE_TTL_SECONDS, settings.SUMMARY_CACHE_STALE_SECONDS),
+    }
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
     return summary
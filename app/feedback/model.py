@@ -1,9 +1,23 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Table,
+    Text,
+    event,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
+RATINGS = range(1, 6)  # the rating scale
+
 
 class Feedback(Base):
     __tablename__ = "feedback"
@@ -16,3 +30,25 @@ class Feedback(Base):
 
     # Relationship
     user = relationship("User", back_populates="feedback")
+
+    __table_args__ = (
+        # Keyset pagination orders and admin filters
+        Index("ix_feedback_created_at_id", "created_at", "id"),
+        Index("ix_feedback_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_feedback_rating_id", "rating", "id"),
+    )
+
+
+class FeedbackRatingCount(Base):
+    """Number of feedback entries per rating, kept in step with `feedback`"""
+
+    __tablename__ = "feedback_rating_counts"
+
+    rating = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(FeedbackRatingCount.__table__, "after_create")
+def _seed_rating_counts(target: Table, connection: Connection, **kw: Any) -> None:
+    """Create every counter row with the table, so writes only ever UPDATE"""
+    connection.execute(target.insert(), [{"rating": r, "total": 0} for r in RATINGS])
@@ -1,8 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class FeedbackBase(BaseModel):
     rating: int = Field(..., ge=1, le=5, description="Rating from 1 to 5")
@@ -13,6 +16,14 @@ class FeedbackCreate(FeedbackBase):
     pass
 
 
+# Body of POST /feedback/batch. The size limit is part of validation, so an
+# oversized list is refused before the rest of it is validated.
+FeedbackBatch = Annotated[
+    List[FeedbackCreate],
+    Field(min_length=1, max_length=settings.FEEDBACK_BATCH_MAX_ITEMS),
+]
+
+
 class FeedbackResponse(FeedbackBase):
     id: int
     user_id: int
@@ -22,6 +33,13 @@ class FeedbackResponse(FeedbackBase):
         from_attributes = True
 
 
+class FeedbackAccepted(BaseModel):
+    # Correlation id for the server logs, which name it if the item is
+    # dropped. It is not stored with the feedback row.
+    ingest_id: str
+    status: str = "queued"
+
+
 class FeedbackWithUser(FeedbackResponse):
     username: str
 
@@ -29,3 +47,24 @@ class FeedbackWithUser(FeedbackResponse):
 class FeedbackSummary(BaseModel):
     total_feedback: int
     average_rating: float
+
+
+class FeedbackSort(str, Enum):
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    RATING = "rating"
+    RATING_DESC = "-rating"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class FeedbackFilter(BaseModel):
+    user_id: Optional[int] = None
+    min_rating: Optional[int] = Field(None, ge=1, le=5)
+    max_rating: Optional[int] = Field(None, ge=1, le=5)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    has_comment: Optional[bool] = None
@@ -1,41 +1,163 @@
-from typing import List
+import csv
+import io
+import json
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import encode_cursor, keyset_after
 from app.user.model import User
 
-from .model import Feedback
-from .schemas import FeedbackCreate, FeedbackSummary, FeedbackWithUser
+from .cache import summary_cache
+from .model import RATINGS, Feedback, FeedbackRatingCount
+from .schemas import (
+    ExportFormat,
+    FeedbackCreate,
+    FeedbackFilter,
+    FeedbackSort,
+    FeedbackSummary,
+    FeedbackWithUser,
+)
+
+EXPORT_COLUMNS = ["id", "user_id", "username", "rating", "comment", "created_at"]
+EXPORT_BATCH_SIZE = 1000
 
 
 class FeedbackService:
 
     @staticmethod
-    def create_feedback(
-        db: Session, feedback_data: FeedbackCreate, user_id: int
+    def _filter_conditions(filters: FeedbackFilter) -> list:
+        """SQL conditions for the given feedback filters"""
+        conditions = []
+        if filters.user_id is not None:
+            conditions.append(Feedback.user_id == filters.user_id)
+        if filters.min_rating is not None:
+            conditions.append(Feedback.rating >= filters.min_rating)
+        if filters.max_rating is not None:
+            conditions.append(Feedback.rating <= filters.max_rating)
+        if filters.created_after is not None:
+            conditions.append(Feedback.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            conditions.append(Feedback.created_at < filters.created_before)
+        if filters.has_comment is True:
+            conditions.append(
+                and_(Feedback.comment.is_not(None), Feedback.comment != "")
+            )
+        elif filters.has_comment is False:
+            conditions.append(or_(Feedback.comment.is_(None), Feedback.comment == ""))
+        return conditions
+
+    @staticmethod
+    async def _increment_rating_counts(
+        db: AsyncSession, increments: Dict[int, int]
+    ) -> None:
+        """Add new feedback to the per-rating counters in the current transaction.
+
+        Every rating's row exists from the moment the table is created, so
+        concurrent writers only ever UPDATE and never race to insert a row.
+        """
+        for rating, count in sorted(increments.items()):
+            await db.execute(
+                update(FeedbackRatingCount)
+                .where(FeedbackRatingCount.rating == rating)
+                .values(total=FeedbackRatingCount.total + count)
+            )
+
+    @staticmethod
+    async def create_feedback(
+        db: AsyncSession, feedback_data: FeedbackCreate, user_id: int
     ) -> Feedback:
         """Create new feedback"""
         db_feedback = Feedback(
             rating=feedback_data.rating, comment=feedback_data.comment, user_id=user_id
         )
         db.add(db_feedback)
-        db.commit()
-        db.refresh(db_feedback)
+        await FeedbackService._increment_rating_counts(db, {feedback_data.rating: 1})
+        await db.commit()
         return db_feedback
 
     @staticmethod
-    def get_all_feedback(
-        db: Session, skip: int = 0, limit: int = 100
-    ) -> List[FeedbackWithUser]:
-        """Get all feedback with user information"""
-        feedback_list = (
-            db.query(Feedback, User.username)
-            .join(User, Feedback.user_id == User.id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+    async def insert_feedback(db: AsyncSession, rows: List[dict]) -> List[Feedback]:
+        """Insert feedback rows with one multi-row INSERT ... RETURNING.
+
+        The per-rating counters are updated in the same transaction; the
+        caller commits.
+        """
+        result = await db.scalars(
+            insert(Feedback).returning(Feedback, sort_by_parameter_order=True), rows
+        )
+        feedback_list = list(result.all())
+        await FeedbackService._increment_rating_counts(
+            db, Counter(row["rating"] for row in rows)
         )
+        return feedback_list
+
+    @staticmethod
+    async def create_feedback_batch(
+        db: AsyncSession, feedback_items: List[FeedbackCreate], user_id: int
+    ) -> List[Feedback]:
+        """Create several feedback entries in a single transaction"""
+        feedback_list = await FeedbackService.insert_feedback(
+            db,
+            [
+                {"rating": item.rating, "comment": item.comment, "user_id": user_id}
+                for item in feedback_items
+            ],
+        )
+        await db.commit()
+        return feedback_list
+
+    @staticmethod
+    async def get_all_feedback(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[FeedbackFilter] = None,
+        sort: FeedbackSort = FeedbackSort.CREATED_AT,
+    ) -> Tuple[List[FeedbackWithUser], Optional[str]]:
+        """Get a page of filtered feedback with user information.
+
+        Pages are ordered by the sort column, then id. Passing the returned
+        cursor continues after the last row at constant cost; ``skip`` is
+        only applied when no cursor is given.
+        """
+        sort_column = (
+            Feedback.rating
+            if sort in (FeedbackSort.RATING, FeedbackSort.RATING_DESC)
+            else Feedback.created_at
+        )
+        descending = sort.value.startswith("-")
+
+        query = select(Feedback, User.username).join(User, Feedback.user_id == User.id)
+        if filters is not None:
+            query = query.where(*FeedbackService._filter_conditions(filters))
+        if descending:
+            query = query.order_by(sort_column.desc(), Feedback.id.desc())
+        else:
+            query = query.order_by(sort_column, Feedback.id)
+
+        if cursor is not None:
+            condition = keyset_after(sort_column, Feedback.id, cursor, descending)
+            if condition is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+            query = query.where(condition)
+        else:
+            query = query.offset(skip)
+
+        result = await db.execute(query.limit(limit + 1))
+        feedback_list = result.all()
+
+        next_cursor = None
+        if limit > 0 and len(feedback_list) > limit:
+            feedback_list = feedback_list[:limit]
+            last = feedback_list[-1][0]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
 
         return [
             FeedbackWithUser(
@@ -47,19 +169,117 @@ class FeedbackService:
                 username=username,
             )
             for feedback, username in feedback_list
-        ]
+        ], next_cursor
 
     @staticmethod
-    def get_feedback_summary(db: Session) -> FeedbackSummary:
-        """Get feedback summary statistics"""
-        result = db.query(
-            func.count(Feedback.id).label("total"),
-            func.avg(Feedback.rating).label("average"),
-        ).first()
+    async def export_feedback(
+        db: AsyncSession,
+        export_format: ExportFormat = ExportFormat.NDJSON,
+        filters: Optional[FeedbackFilter] = None,
+    ) -> AsyncIterator[str]:
+        """Stream every matching feedback row as NDJSON lines or CSV.
 
-        total_feedback = result.total or 0
-        average_rating = float(result.average) if result.average else 0.0
+        Rows are read through a server-side cursor in batches of
+        EXPORT_BATCH_SIZE, so memory use does not grow with the table. The
+        stream outlives the request handler and therefore uses its own
+        session bound to the request's engine.
+        """
+        query = (
+            select(
+                Feedback.id,
+                Feedback.user_id,
+                User.username,
+                Feedback.rating,
+                Feedback.comment,
+                Feedback.created_at,
+            )
+            .join(User, Feedback.user_id == User.id)
+            .order_by(Feedback.created_at, Feedback.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if filters is not None:
+            query = query.where(*FeedbackService._filter_conditions(filters))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+
+        async with AsyncSession(db.bind) as session:
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                for row in partition:
+                    created_at = row.created_at.isoformat() if row.created_at else None
+                    values = (*row[:-1], created_at)
+                    if export_format == ExportFormat.CSV:
+                        writer.writerow(values)
+                    else:
+                        record = dict(zip(EXPORT_COLUMNS, values))
+                        buffer.write(json.dumps(record) + "\n")
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    async def get_feedback_summary(db: AsyncSession) -> FeedbackSummary:
+        """Get feedback summary statistics from the per-rating counters"""
+        result = (
+            await db.execute(
+                select(
+                    func.sum(FeedbackRatingCount.total).label("total"),
+                    func.sum(
+                        FeedbackRatingCount.rating * FeedbackRatingCount.total
+                    ).label("rating_sum"),
+                )
+            )
+        ).one()
+
+        total_feedback = int(result.total or 0)
+        average_rating = (
+            float(result.rating_sum) / total_feedback if total_feedback else 0.0
+        )
 
         return FeedbackSummary(
             total_feedback=total_feedback, average_rating=round(average_rating, 2)
         )
+
+    @staticmethod
+    async def get_cached_feedback_summary(db: AsyncSession) -> FeedbackSummary:
+        """Get feedback summary statistics through the summary cache"""
+
+        async def load() -> FeedbackSummary:
+            # Loads may outlive the request, so they use their own session
+            async with AsyncSession(db.bind, expire_on_commit=False) as session:
+                return await FeedbackService.get_feedback_summary(session)
+
+        summary: FeedbackSummary = await summary_cache.get(load)
+        return summary
+
+    @staticmethod
+    async def rebuild_feedback_summary(db: AsyncSession) -> FeedbackSummary:
+        """Recompute the per-rating counters from the feedback table"""
+        existing = set(await db.scalars(select(FeedbackRatingCount.rating)))
+        for rating in RATINGS:
+            if rating not in existing:
+                db.add(FeedbackRatingCount(rating=rating, total=0))
+        await db.commit()
+
+        # Lock the counters so concurrent inserts wait for the rebuild to finish;
+        # their rows are then added on top of the recomputed totals.
+        await db.execute(select(FeedbackRatingCount).with_for_update())
+        result = await db.execute(
+            select(Feedback.rating, func.count(Feedback.id)).group_by(Feedback.rating)
+        )
+        counts: Dict[int, int] = {rating: total for rating, total in result.all()}
+        for rating in RATINGS:
+            await db.execute(
+                update(FeedbackRatingCount)
+                .where(FeedbackRatingCount.rating == rating)
+                .values(total=counts.get(rating, 0))
+            )
+        await db.commit()
+
+        return await FeedbackService.get_feedback_summary(db)
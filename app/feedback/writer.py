@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import uuid
+from contextlib import suppress
+from typing import AsyncContextManager, Callable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+from .schemas import FeedbackAccepted, FeedbackCreate
+from .service import FeedbackService
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class FeedbackWriter:
+    """Write-behind buffer that stores queued feedback in batches.
+
+    ``submit`` only validates capacity and enqueues, so the request is
+    answered without waiting for a commit. A background task collects up
+    to ``batch_size`` items, or whatever arrived within ``flush_interval``
+    seconds of the first one, and inserts them in a single transaction.
+
+    Queued items live only in this process's memory: they survive a
+    graceful shutdown (drained for up to ``drain_timeout`` seconds) but
+    are lost if the worker crashes or is killed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AsyncContextManager[AsyncSession]
+        ] = AsyncSessionLocal,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        drain_timeout: float = 10.0,
+        max_retries: int = 2,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drain_timeout = drain_timeout
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: List[tuple] = []  # batch items not yet written or dropped
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closing
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting to be written"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop"""
+        if self._task is not None:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(self._queue))
+
+    async def stop(self) -> None:
+        """Stop accepting feedback and flush what is already queued.
+
+        Queueing the stop marker and writing the remaining items share one
+        ``drain_timeout`` deadline. Items still queued or being written
+        when it passes are counted as dropped and their ingest ids logged.
+        """
+        if self._task is None or self._queue is None:
+            return
+        self._closing = True
+        queue, task = self._queue, self._task
+
+        async def drain() -> None:
+            await queue.put(_STOP)
+            await task
+
+        try:
+            await asyncio.wait_for(drain(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            lost = list(self._in_flight)
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not _STOP:
+                    lost.append(item)
+            self.dropped += len(lost)
+            logger.error(
+                "Feedback writer drain timed out, %d items lost: %s",
+                len(lost),
+                ", ".join(ingest_id for ingest_id, _ in lost),
+            )
+        self._in_flight = []
+        self._task = None
+        self._queue = None
+
+    def submit(self, feedback_data: FeedbackCreate, user_id: int) -> FeedbackAccepted:
+        """Queue feedback for writing and return its receipt"""
+        if not self.running or self._queue is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Feedback ingestion is not running",
+            )
+
+        ingest_id = uuid.uuid4().hex
+        row = {
+            "rating": feedback_data.rating,
+            "comment": feedback_data.comment,
+            "user_id": user_id,
+        }
+        try:
+            self._queue.put_nowait((ingest_id, row))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Feedback queue is full, please retry",
+                headers={"Retry-After": "1"},
+            )
+        return FeedbackAccepted(ingest_id=ingest_id)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._in_flight = batch
+            await self._flush(batch)
+            self._in_flight = []
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        """Write a batch in one transaction, retrying transient failures.
+
+        A row the database rejects, e.g. one whose user was deleted while it
+        was queued, fails the whole transaction on every retry. Such a batch
+        is split in halves instead, so only the rejected items are dropped.
+        """
+        rows = [row for _, row in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.session_factory() as db:
+                    await FeedbackService.insert_feedback(db, rows)
+                    await db.commit()
+                self.written += len(rows)
+                self._settle(batch)
+                return
+            except (IntegrityError, DataError):
+                if len(batch) == 1:
+                    logger.exception("Queued feedback %s was rejected", batch[0][0])
+                    break
+                middle = len(batch) // 2
+                await self._flush(batch[:middle])
+                await self._flush(batch[middle:])
+                return
+            except Exception:
+                logger.exception(
+                    "Writing %d queued feedback items failed (attempt %d)",
+                    len(rows),
+                    attempt + 1,
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(0.1 * 2**attempt, 2.0))
+
+        self.dropped += len(rows)
+        self._settle(batch)
+        logger.error(
+            "Dropped queued feedback %s", ", ".join(ingest_id for ingest_id, _ in batch)
+        )
+
+    def _settle(self, batch: List[tuple]) -> None:
+        """Take written or dropped items out of the in-flight batch"""
+        settled = {ingest_id for ingest_id, _ in batch}
+        self._in_flight = [item for item in self._in_flight if item[0] not in settled]
+
+
+feedback_writer = FeedbackWriter(
+    max_queue=settings.FEEDBACK_QUEUE_SIZE,
+    batch_size=settings.FEEDBACK_FLUSH_BATCH_SIZE,
+    flush_interval=settings.FEEDBACK_FLUSH_INTERVAL_MS / 1000,
+    drain_timeout=settings.FEEDBACK_DRAIN_TIMEOUT_SECONDS,
+    max_retries=settings.FEEDBACK_WRITE_RETRIES,
+)
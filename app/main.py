@@ -1,43 +1,106 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers
 from app.auth.controller import router as auth_router
+from app.auth.controller import well_known_router
+from app.auth.revocation import maintain_revocations
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import async_engine
+from app.core.hashing import hashing_executor
+from app.core.keys import get_key_set
+from app.core.metrics import publish_snapshots
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware
 from app.feedback.controller import router as feedback_router
+from app.feedback.writer import feedback_writer
 from app.role.controller import router as role_router
+from app.system.controller import router as system_router
 from app.user.controller import router as user_router
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
-# Create FastAPI app
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background services and release shared resources on exit.
+
+    The database pool and the password hashing processes are created on
+    first use, so startup itself does no I/O and the worker can answer
+    requests as soon as it is imported.
+    """
+    get_key_set()  # fail at startup, not on the first login, on bad JWT keys
+    if settings.FEEDBACK_WRITE_BEHIND:
+        feedback_writer.start()
+    tasks = [
+        asyncio.create_task(
+            maintain_revocations(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+        )
+    ]
+    if settings.METRICS_DIR:
+        tasks.append(
+            asyncio.create_task(
+                publish_snapshots(
+                    settings.METRICS_DIR, settings.METRICS_PUBLISH_INTERVAL_SECONDS
+                )
+            )
+        )
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        # Flush queued feedback before the pool it writes through goes away
+        await feedback_writer.stop()
+        hashing_executor.shutdown()
+        await async_engine.dispose()
+
+
+def include_routers(app: FastAPI) -> None:
+    """Register every module's router"""
+    app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
+    app.include_router(well_known_router, tags=["Authentication"])
+    app.include_router(user_router, prefix="/user", tags=["User"])
+    app.include_router(role_router, prefix="/admin", tags=["Role"])
+    app.include_router(feedback_router, tags=["Feedback"])
+    app.include_router(system_router, tags=["System"])
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application"""
+    app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Configure properly for production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Server-Timing"],
+    )
+    # Added last so they are outermost and time the whole request
+    app.add_middleware(
+        QueryStatsMiddleware, server_timing=settings.SERVER_TIMING_HEADER
+    )
+    app.add_middleware(MetricsMiddleware)
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure properly for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    include_routers(app)
 
-# Include routers
-app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
-app.include_router(user_router, prefix="/user", tags=["User"])
-app.include_router(role_router, prefix="/admin", tags=["Role"])
-app.include_router(feedback_router, tags=["Feedback"])
+    @app.get("/")
+    async def root():
+        """Root endpoint"""
+        return {"message": "Welcome to Feedback Collector API"}
 
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint"""
+        return {"status": "healthy"}
 
-@app.get("/")
-async def root():
-    """Root endpoint"""
-    return {"message": "Welcome to Feedback Collector API"}
+    return app
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
+app = create_app()
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_admin
+from app.auth.principal import Principal
 from app.core.database import get_db
-from app.user.model import User
 from app.user.schemas import UserResponse
 
 from .schemas import RoleUpdate
@@ -16,9 +16,9 @@ router = APIRouter()
 async def update_user_role(
     user_id: int,
     role_data: RoleUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
 ) -> UserResponse:
     """Update user role (Admin only)"""
-    updated_user = RoleService.update_user_role(db, user_id, role_data)
+    updated_user = await RoleService.update_user_role(db, user_id, role_data)
     return updated_user
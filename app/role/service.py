@@ -1,8 +1,9 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.user.cache import user_cache
 from app.user.model import User
-from app.user.service import UserService
 
 from .schemas import RoleUpdate
 
@@ -10,7 +11,9 @@ from .schemas import RoleUpdate
 class RoleService:
 
     @staticmethod
-    def update_user_role(db: Session, user_id: int, role_data: RoleUpdate) -> User:
+    async def update_user_role(
+        db: AsyncSession, user_id: int, role_data: RoleUpdate
+    ) -> User:
         """Update user role (admin only)"""
         # Validate role
         if role_data.role not in ["user", "admin"]:
@@ -19,16 +22,19 @@ class RoleService:
                 detail="Invalid role. Must be 'user' or 'admin'",
             )
 
-        # Get user
-        user = UserService.get_user_by_id(db, user_id)
+        # Update role
+        user = await db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(role=role_data.role)
+            .returning(User)
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        # Update role
-        user.role = role_data.role
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        user_cache.invalidate(user_id)
 
         return user
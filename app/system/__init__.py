@@ -0,0 +1 @@
+# System module
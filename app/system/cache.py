@@ -0,0 +1,8 @@
+from app.core.cache import RefreshingValue
+from app.core.config import settings
+
+# Latest readiness probe result. Concurrent /ready calls share one probe and
+# its result is reused for READY_CACHE_SECONDS, so polling adds no load.
+readiness_cache = RefreshingValue(
+    "readiness", ttl=settings.READY_CACHE_SECONDS, stale_ttl=0.0
+)
@@ -0,0 +1,47 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth.dependencies import require_admin
+from app.auth.principal import Principal
+
+from .schemas import CacheStats, PoolStatus, ReadinessStatus
+from .service import SystemService
+
+router = APIRouter()
+
+
+@router.get("/admin/system/pool", response_model=PoolStatus)
+async def get_pool_status(
+    current_user: Principal = Depends(require_admin),
+) -> PoolStatus:
+    """Get database connection pool statistics (Admin only)"""
+    return SystemService.get_pool_status()
+
+
+@router.get("/admin/system/caches", response_model=List[CacheStats])
+async def get_cache_stats(
+    current_user: Principal = Depends(require_admin),
+) -> List[CacheStats]:
+    """Get in-process cache statistics (Admin only)"""
+    return SystemService.get_cache_stats()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Prometheus metrics for all workers"""
+    return PlainTextResponse(
+        SystemService.render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@router.get("/ready", response_model=ReadinessStatus)
+async def get_readiness(response: Response) -> ReadinessStatus:
+    """Readiness probe: 503 while the database is unreachable, slow or saturated"""
+    readiness = await SystemService.get_readiness()
+    if readiness.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response.headers["Retry-After"] = "1"
+    return readiness
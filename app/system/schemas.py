@@ -0,0 +1,38 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    overflow_peak: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_avg: float
+    wait_seconds_max: float
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+
+class ReadinessStatus(BaseModel):
+    status: str  # "ready", "degraded" or "unavailable"
+    database_latency_ms: Optional[float] = None
+    pool_in_use: Optional[int] = None
+    pool_capacity: Optional[int] = None
+    problems: List[str] = []
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import metrics
+from app.core.cache import caches
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.pool import get_pool_status, pool_stats
+
+from .cache import readiness_cache
+from .schemas import CacheStats, PoolStatus, ReadinessStatus
+
+
+class SystemService:
+    # Pool timeouts seen by the previous readiness probe
+    _last_pool_timeouts = 0
+
+    @staticmethod
+    def get_pool_status() -> PoolStatus:
+        """Get connection pool occupancy and wait times for this worker"""
+        return PoolStatus(**get_pool_status(async_engine.pool))
+
+    @staticmethod
+    def get_cache_stats() -> List[CacheStats]:
+        """Get size and hit/miss counters of the in-process caches"""
+        return [CacheStats(**cache.stats()) for cache in caches.values()]
+
+    @staticmethod
+    def collect_metrics() -> None:
+        """Copy pool and cache counters into the metrics registry"""
+        pool = get_pool_status(async_engine.pool)
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in pool:
+                metrics.db_pool_connections.set(pool[state], state=state)
+        metrics.db_pool_checkouts.set_total(pool["checkouts"])
+        metrics.db_pool_timeouts.set_total(pool["timeouts"])
+        metrics.db_pool_wait.set_total(pool["wait_seconds_total"])
+
+        for cache in caches.values():
+            stats = cache.stats()
+            metrics.cache_hits.set_total(stats["hits"], cache=stats["name"])
+            metrics.cache_misses.set_total(stats["misses"], cache=stats["name"])
+            metrics.cache_evictions.set_total(stats["evictions"], cache=stats["name"])
+            metrics.cache_entries.set(stats["size"], cache=stats["name"])
+
+    @staticmethod
+    def render_metrics() -> str:
+        """Prometheus text exposition of every worker's metrics"""
+        return metrics.registry.render(settings.METRICS_DIR)
+
+    @staticmethod
+    async def _ping(engine: AsyncEngine) -> None:
+        """Round trip to the database on a pooled connection"""
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def probe_readiness(engine: Optional[AsyncEngine] = None) -> ReadinessStatus:
+        """Check database reachability and pool headroom for this worker"""
+        engine = engine or async_engine
+        readiness = ReadinessStatus(status="ready")
+        pool = get_pool_status(engine.pool)
+        if "size" in pool:
+            readiness.pool_in_use = pool["checked_out"]
+            # A negative max_overflow means unlimited overflow: no capacity
+            if pool["max_overflow"] >= 0:
+                readiness.pool_capacity = pool["size"] + pool["max_overflow"]
+                if readiness.pool_in_use >= readiness.pool_capacity:
+                    readiness.problems.append("connection pool exhausted")
+
+        timeouts = pool_stats.timeouts
+        if timeouts > SystemService._last_pool_timeouts:
+            readiness.problems.append("requests timed out waiting for a connection")
+        SystemService._last_pool_timeouts = timeouts
+
+        if readiness.problems:
+            # Waiting for a connection would only add to the queue
+            readiness.status = "degraded"
+            return readiness
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                SystemService._ping(engine), settings.READY_DB_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            readiness.status = "unavailable"
+            readiness.problems.append("database did not answer in time")
+            return readiness
+        except Exception as exc:
+            readiness.status = "unavailable"
+            readiness.problems.append(f"database unreachable: {type(exc).__name__}")
+            return readiness
+
+        readiness.database_latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        if readiness.database_latency_ms > settings.READY_SLOW_DB_MS:
+            readiness.status = "degraded"
+            readiness.problems.append("database is slow")
+        return readiness
+
+    @staticmethod
+    async def get_readiness() -> ReadinessStatus:
+        """Latest readiness probe result, probing at most once per interval"""
+        readiness: ReadinessStatus = await readiness_cache.get(
+            SystemService.probe_readiness
+        )
+        return readiness
+
+
+metrics.registry.add_collector(SystemService.collect_metrics)
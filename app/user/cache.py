@@ -0,0 +1,11 @@
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Principals of recently authenticated users, keyed by user id. Writes that
+# change a user invalidate the entry in this process; other workers pick the
+# change up once USER_CACHE_TTL_SECONDS has elapsed.
+user_cache = TTLCache(
+    "users",
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
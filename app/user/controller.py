@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_admin
+from app.auth.principal import Principal
 from app.core.database import get_db
 
 from .model import User
@@ -23,13 +24,22 @@ async def get_user_profile(
 
 @router.get("/users", response_model=List[UserResponse])
 async def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
 ) -> List[UserResponse]:
-    """Get all users (Admin only)"""
-    users = UserService.get_all_users(db, skip=skip, limit=limit)
+    """Get all users (Admin only)
+
+    The next page's cursor is returned in the ``X-Next-Cursor`` header.
+    """
+    users, next_cursor = await UserService.get_all_users(
+        db, skip=skip, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return users
 
 
@@ -37,11 +47,11 @@ async def get_all_users(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
 ) -> UserResponse:
     """Update user (Admin only)"""
-    updated_user = UserService.update_user(db, user_id, user_data)
+    updated_user = await UserService.update_user(db, user_id, user_data)
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -1,9 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.core.hashing import hash_password
+from app.core.pagination import encode_cursor, keyset_after
 
+from .cache import user_cache
 from .model import User
 from .schemas import UserCreate, UserUpdate
 
@@ -11,62 +15,97 @@ from .schemas import UserCreate, UserUpdate
 class UserService:
 
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         """Create a new user"""
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         db_user = User(
             username=user_data.username,
             email=user_data.email,
             hashed_password=hashed_password,
             role="user",  # Default role
+            updated_at=None,  # None until the first update; avoids a reload
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
 
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return db.query(User).filter(User.id == user_id).first()
+        user: Optional[User] = await db.scalar(select(User).where(User.id == user_id))
+        return user
 
     @staticmethod
-    def get_user_by_username(db: Session, username: str) -> Optional[User]:
-        """Get user by username"""
-        return db.query(User).filter(User.username == username).first()
+    async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+        """Get user by username, ignoring case"""
+        user: Optional[User] = await db.scalar(
+            select(User).where(func.lower(User.username) == func.lower(username))
+        )
+        return user
 
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> Optional[User]:
-        """Get user by email"""
-        return db.query(User).filter(User.email == email).first()
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email, ignoring case"""
+        user: Optional[User] = await db.scalar(
+            select(User).where(func.lower(User.email) == func.lower(email))
+        )
+        return user
 
     @staticmethod
-    def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get all users (admin only)"""
-        return db.query(User).offset(skip).limit(limit).all()
+    async def get_all_users(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[User], Optional[str]]:
+        """Get a page of users ordered by (created_at, id) (admin only)"""
+        query = select(User).order_by(User.created_at, User.id)
+        if cursor is not None:
+            condition = keyset_after(User.created_at, User.id, cursor)
+            if condition is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+            query = query.where(condition)
+        else:
+            query = query.offset(skip)
+
+        users = list((await db.scalars(query.limit(limit + 1))).all())
+
+        next_cursor = None
+        if limit > 0 and len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at, int(users[-1].id))
+
+        return users, next_cursor
 
     @staticmethod
-    def update_user(db: Session, user_id: int, user_data: UserUpdate) -> Optional[User]:
+    async def update_user(
+        db: AsyncSession, user_id: int, user_data: UserUpdate
+    ) -> Optional[User]:
         """Update user information"""
-        db_user = db.query(User).filter(User.id == user_id).first()
+        update_data = user_data.dict(exclude_unset=True)
+        if not update_data:
+            return await UserService.get_user_by_id(db, user_id)
+
+        db_user = await db.scalar(
+            update(User).where(User.id == user_id).values(**update_data).returning(User)
+        )
         if not db_user:
             return None
 
-        update_data = user_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_user, field, value)
-
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        user_cache.invalidate(user_id)
         return db_user
 
     @staticmethod
-    def delete_user(db: Session, user_id: int) -> bool:
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
         """Delete user"""
-        db_user = db.query(User).filter(User.id == user_id).first()
+        db_user = await UserService.get_user_by_id(db, user_id)
         if not db_user:
             return False
 
-        db.delete(db_user)
-        db.commit()
+        await db.delete(db_user)
+        await db.commit()
+        user_cache.invalidate(user_id)
         return True
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Load test the main endpoints and compare the results against a baseline.
+
+Seeds a database with --users users and --feedback feedback rows, then
+drives each scenario with --concurrency concurrent clients for --requests
+requests and reports latency percentiles, throughput and, when the app
+runs in-process, SQL statements per request.
+
+By default the app is served in-process through httpx's ASGI transport
+against a throwaway SQLite database. Pass --database-url to use another
+database, e.g. a local PostgreSQL: its tables are DROPPED and recreated
+before seeding, so never point it at data you want to keep. Pass --url to
+drive an already running server instead; --database-url must then be the
+database that server uses, so it can be seeded.
+
+Baselines:
+
+    python benchmarks/load.py --save benchmarks/baseline.json
+    python benchmarks/load.py --compare benchmarks/baseline.json
+
+--compare exits with status 1 when a scenario's p95 latency or throughput
+is worse than the baseline by more than --tolerance, or when it issues
+more statements per request than before. Compare runs made with the same
+seed sizes, request counts and concurrency.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+sys.path.append(os.getcwd())
+
+PASSWORD = "benchmark-password"
+ADMIN_USERNAME = "bench-admin"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def seed(users: int, feedback: int, chunk: int = 5000) -> None:
+    """Create the schema and fill it with users and feedback"""
+    from sqlalchemy import insert
+
+    from app.auth.model import RefreshToken  # noqa: F401
+    from app.core.database import AsyncSessionLocal, Base, async_engine
+    from app.core.security import get_password_hash
+    from app.feedback.model import Feedback
+    from app.feedback.service import FeedbackService
+    from app.user.model import User
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    # One bcrypt hash shared by every seeded user keeps seeding fast
+    hashed_password = get_password_hash(PASSWORD)
+    rows = [
+        {
+            "username": f"bench-user-{i}",
+            "email": f"bench-user-{i}@example.com",
+            "hashed_password": hashed_password,
+            "role": "user",
+            "is_active": True,
+        }
+        for i in range(users)
+    ]
+    rows.append(
+        {
+            "username": ADMIN_USERNAME,
+            "email": "bench-admin@example.com",
+            "hashed_password": hashed_password,
+            "role": "admin",
+            "is_active": True,
+        }
+    )
+
+    rng = random.Random(0)
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), chunk):
+            await db.execute(insert(User), rows[start : start + chunk])
+        for start in range(0, feedback, chunk):
+            await db.execute(
+                insert(Feedback),
+                [
+                    {
+                        "user_id": rng.randint(1, users),
+                        "rating": rng.randint(1, 5),
+                        "comment": f"benchmark feedback {i}",
+                    }
+                    for i in range(start, min(start + chunk, feedback))
+                ],
+            )
+        await db.commit()
+        await FeedbackService.rebuild_feedback_summary(db)
+
+
+class StatementCounter:
+    """Count statements executed by the in-process app"""
+
+    def __init__(self):
+        from sqlalchemy import event
+
+        from app.core.database import async_engine
+
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, *args):
+        self.count += 1
+
+
+async def login(client: httpx.AsyncClient, username: str) -> dict:
+    response = await client.post(
+        "/auth/login", json={"username": username, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+class RefreshTokenPool:
+    """Refresh tokens for concurrent workers; each token is in use by at
+    most one request and is replaced by its rotated successor"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self._tokens: asyncio.Queue = asyncio.Queue()
+
+    async def fill(self, size: int, users: int) -> None:
+        """Log in once per token, outside the timed scenario"""
+        for n in range(size):
+            tokens = await login(self.client, f"bench-user-{n % users}")
+            self._tokens.put_nowait(tokens["refresh_token"])
+
+    async def send(self, i: int) -> httpx.Response:
+        token = await self._tokens.get()
+        response = await self.client.post(
+            "/auth/refresh", json={"refresh_token": token}
+        )
+        if response.status_code == 200:
+            token = response.json()["refresh_token"]
+        self._tokens.put_nowait(token)
+        return response
+
+
+async def run_scenario(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+    counter: Optional[StatementCounter],
+) -> dict:
+    """Send ``requests`` requests from ``concurrency`` workers"""
+    latencies: List[float] = []
+    errors = 0
+    issued = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in issued:
+            start = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    statements_before = counter.count if counter else 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "queries_per_request": (
+            round((counter.count - statements_before) / len(latencies), 2)
+            if counter
+            else None
+        ),
+    }
+
+
+async def run(args) -> Dict[str, dict]:
+    await seed(args.users, args.feedback)
+
+    async with AsyncExitStack() as stack:
+        counter = None
+        if args.url:
+            transport = None
+            base_url = args.url
+        else:
+            from app.main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://benchmark"
+            counter = StatementCounter()
+
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60.0)
+        )
+        user_token = (await login(client, "bench-user-0"))["access_token"]
+        admin_token = (await login(client, ADMIN_USERNAME))["access_token"]
+        user_headers = {"Authorization": f"Bearer {user_token}"}
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        refresh_tokens = RefreshTokenPool(client)
+
+        scenarios = {
+            "POST /auth/login": lambda i: client.post(
+                "/auth/login",
+                json={"username": f"bench-user-{i % args.users}", "password": PASSWORD},
+            ),
+            "POST /auth/refresh": refresh_tokens.send,
+            "POST /feedback": lambda i: client.post(
+                "/feedback",
+                json={"rating": i % 5 + 1, "comment": "load test"},
+                headers=user_headers,
+            ),
+            "GET /feedback/summary": lambda i: client.get("/feedback/summary"),
+            "GET /admin/feedback": lambda i: client.get(
+                "/admin/feedback", params={"limit": 50}, headers=admin_headers
+            ),
+        }
+
+        results = {}
+        for name, send in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            if send == refresh_tokens.send:
+                await refresh_tokens.fill(args.concurrency, args.users)
+            results[name] = await run_scenario(
+                send, args.requests, args.concurrency, counter
+            )
+            print_result(name, results[name])
+        return results
+
+
+def print_result(name: str, result: dict) -> None:
+    queries = result["queries_per_request"]
+    print(
+        f"{name:<24} {result['rps']:>8.1f} req/s  "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  "
+        f"queries {'-' if queries is None else queries:>5}  "
+        f"errors {result['errors']}"
+    )
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float):
+    """Describe every scenario that regressed against the baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']} ms vs {before['p95_ms']} ms"
+            )
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rps']} req/s vs {before['rps']}")
+        if (
+            result["queries_per_request"] is not None
+            and before.get("queries_per_request") is not None
+            # Averages include occasional cache misses, so only a change of
+            # at least half a statement per request counts
+            and result["queries_per_request"] - before["queries_per_request"] >= 0.5
+        ):
+            regressions.append(
+                f"{name}: {result['queries_per_request']} queries per request "
+                f"vs {before['queries_per_request']}"
+            )
+    return regressions
+
+
+def run_config(args) -> dict:
+    """Parameters a baseline is only comparable under"""
+    return {
+        "users": args.users,
+        "feedback": args.feedback,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "target": "url" if args.url else "in-process",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--url", help="drive a running server instead")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--feedback", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--only", action="append", help="scenario name, repeatable")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so the URL must be set before the app
+        # modules are first imported
+        os.environ["DATABASE_URL"] = args.database_url or (
+            f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        )
+        results = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"config": run_config(args), "scenarios": results}, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != run_config(args):
+            print(f"Note: baseline was recorded with {baseline.get('config')}")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
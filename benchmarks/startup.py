@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measure worker cold start: import-time breakdown and time-to-first-request.
+
+The import profile runs ``python -X importtime -c "import app.main"`` and
+sums the self time of every module under its top-level package, so the
+heaviest dependencies stand out. Time-to-first-request starts uvicorn in a
+fresh process and polls a path until it answers 200; the median over
+``--runs`` is compared against ``--budget-ms`` and the script exits with
+status 1 when it is over budget.
+
+Uses DATABASE_URL from the environment; /health needs no database.
+
+Usage: python benchmarks/startup.py [--runs 5] [--budget-ms 1500] [--path /health]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile() -> Counter:
+    """Self import time in microseconds per top-level package"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    totals = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    return totals
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(path: str, timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn until ``path`` answers 200"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before answering")
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"{url} did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    profile = import_profile()
+    print(f"Import time of app.main: {sum(profile.values()) / 1000:.1f} ms")
+    for package, self_us in profile.most_common(args.top):
+        print(f"  {package:<24}{self_us / 1000:>8.1f} ms")
+
+    samples = [time_to_first_request(args.path) * 1000 for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(
+        f"Time to first {args.path}: median {median:.0f} ms "
+        f"(min {min(samples):.0f}, max {max(samples):.0f}, runs {args.runs}); "
+        f"budget {args.budget_ms:.0f} ms"
+    )
+    if median > args.budget_ms:
+        print("Over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Count the SQL statements issued by each service write path.
+
+Runs every write against a throwaway SQLite database and prints how many
+statements reach the database per call (BEGIN/COMMIT are not counted).
+
+Each write used to be followed by a refresh SELECT, and the updates also
+loaded the row before changing it. They now get generated columns back
+with INSERT/UPDATE ... RETURNING:
+
+    write                            before  after
+    UserService.create_user               2      1
+    UserService.update_user               3      1
+    RoleService.update_user_role          3      1
+    FeedbackService.create_feedback       3      2
+
+create_feedback also bumps its rating's counter in the same transaction;
+the counter row is seeded first so the numbers are the steady state.
+
+Usage: python benchmarks/write_queries.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.feedback.schemas import FeedbackCreate
+from app.feedback.service import FeedbackService
+from app.role.schemas import RoleUpdate
+from app.role.service import RoleService
+from app.user.schemas import UserCreate, UserUpdate
+from app.user.service import UserService
+
+
+class StatementCounter:
+    """Collect the statements executed on an engine"""
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def reset(self):
+        self.statements = []
+
+
+async def count_writes(path: str) -> list:
+    """Run each write once and return (name, statement count, statements)"""
+    create_engine(f"sqlite:///{path}").dispose()
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+    counter = StatementCounter(engine)
+    results = []
+
+    async def measure(name, write):
+        async with session_factory() as db:
+            counter.reset()
+            value = await write(db)
+            results.append((name, len(counter.statements), list(counter.statements)))
+            return value
+
+    user = await measure(
+        "UserService.create_user",
+        lambda db: UserService.create_user(
+            db,
+            UserCreate(username="bench", email="bench@example.com", password="pw"),
+        ),
+    )
+    await measure(
+        "UserService.update_user",
+        lambda db: UserService.update_user(
+            db, user.id, UserUpdate(email="bench2@example.com")
+        ),
+    )
+    await measure(
+        "RoleService.update_user_role",
+        lambda db: RoleService.update_user_role(db, user.id, RoleUpdate(role="admin")),
+    )
+    async with session_factory() as db:
+        await FeedbackService.create_feedback(
+            db, FeedbackCreate(rating=5, comment="seed"), user.id
+        )
+    await measure(
+        "FeedbackService.create_feedback",
+        lambda db: FeedbackService.create_feedback(
+            db, FeedbackCreate(rating=5, comment="bench"), user.id
+        ),
+    )
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    verbose = "-v" in sys.argv
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(count_writes(os.path.join(tmp, "bench.db")))
+
+    print(f"{'write':<36}{'statements':>10}")
+    for name, count, statements in results:
+        print(f"{name:<36}{count:>10}")
+        if verbose:
+            for statement in statements:
+                print("    " + " ".join(statement.split())[:160])
+
+
+if __name__ == "__main__":
+    main()
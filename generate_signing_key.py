@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Create or retire JWT signing keys in JWT_KEYS_DIR.
+
+    python generate_signing_key.py 2026-10 [--type ec|rsa] [--dir keys]
+    python generate_signing_key.py 2026-04 --retire [--dir keys]
+
+A new key is written as <kid>.pem (private, mode 0600). Retiring a key
+replaces its private key with the public one, so it keeps verifying the
+tokens it signed but can no longer sign; delete the file once those
+tokens have expired.
+"""
+
+import argparse
+import os
+import sys
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+sys.path.append(os.getcwd())
+
+
+def generate_key(path: str, key_type: str) -> None:
+    """Write a new private key"""
+    if key_type == "rsa":
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        key = ec.generate_private_key(ec.SECP256R1())
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+
+
+def retire_key(path: str) -> None:
+    """Replace a private key with its public key"""
+    with open(path, "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password=None)
+    pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pem)
+    os.replace(tmp_path, path)
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("kid", help="key id, used as the file name")
+    parser.add_argument("--type", choices=["ec", "rsa"], default="ec")
+    parser.add_argument("--dir", default=settings.JWT_KEYS_DIR or "keys")
+    parser.add_argument("--retire", action="store_true")
+    args = parser.parse_args()
+
+    path = os.path.join(args.dir, f"{args.kid}.pem")
+    if args.retire:
+        retire_key(path)
+        print(f"Retired {path}: it now only verifies existing tokens")
+        return
+
+    os.makedirs(args.dir, exist_ok=True)
+    if os.path.exists(path):
+        print(f"{path} already exists")
+        sys.exit(1)
+    generate_key(path, args.type)
+    print(f"Created {path}; it is published in the JWKS once the app reloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Production server configuration: gunicorn managing uvicorn workers.
+
+    gunicorn app.main:app  # picks this file up from the working directory
+
+Values come from the application settings (environment or .env), see the
+"Production server" block in app/core/config.py.
+
+Every worker is a separate process with its own event loop, database pool
+and caches:
+
+- database connections: up to workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+  per server; set DB_MAX_CONNECTIONS to have startup warn when that exceeds
+  what PostgreSQL (max_connections, minus other clients) can accept
+- bcrypt processes: workers * HASHING_POOL_SIZE; when unset, the CPUs are
+  split between the workers instead of each worker starting one per CPU
+- caches and the write-behind queue are per worker, so their sizes
+  multiply the same way
+- metrics are per worker too; set METRICS_DIR so /metrics reports the sum
+"""
+
+import glob
+import logging
+import multiprocessing
+import os
+
+from app.core.config import settings
+from app.core.pool import connection_budget
+
+logger = logging.getLogger("gunicorn.error")
+
+cpus = multiprocessing.cpu_count()
+
+# Uvicorn worker; with uvicorn[standard] installed it runs on uvloop and
+# parses HTTP with httptools
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = settings.WEB_CONCURRENCY or cpus
+bind = settings.WEB_BIND
+backlog = settings.WEB_BACKLOG
+keepalive = settings.WEB_KEEPALIVE_SECONDS
+timeout = settings.WEB_TIMEOUT_SECONDS
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+
+# Importing the app opens no connections, processes or event loops (they are
+# created on first use in each worker), so it is safe to import once in the
+# master and fork: workers boot faster and share the imported code pages.
+preload_app = settings.WEB_PRELOAD
+
+# Forked workers inherit this settings object, and with preload_app the
+# hashing pool reads it when the app is imported below.
+if settings.HASHING_POOL_SIZE is None:
+    settings.HASHING_POOL_SIZE = max(1, cpus // workers)
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """Reset shared metrics and check the per-server resource totals"""
+    if settings.METRICS_DIR:
+        # Snapshots of a previous run would be added to this run's totals
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+            os.remove(path)
+
+    connections = connection_budget(
+        workers, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    )
+    logger.info(
+        "%d workers: up to %d database connections, %d bcrypt processes",
+        workers,
+        connections,
+        workers * settings.HASHING_POOL_SIZE,
+    )
+    if settings.DB_MAX_CONNECTIONS is not None and (
+        connections > settings.DB_MAX_CONNECTIONS
+    ):
+        logger.warning(
+            "%d workers * (DB_POOL_SIZE %d + DB_MAX_OVERFLOW %d) = %d database "
+            "connections exceeds DB_MAX_CONNECTIONS %d; lower WEB_CONCURRENCY "
+            "or the pool sizes, or put PgBouncer in front of PostgreSQL",
+            workers,
+            settings.DB_POOL_SIZE,
+            settings.DB_MAX_OVERFLOW,
+            connections,
+            settings.DB_MAX_CONNECTIONS,
+        )
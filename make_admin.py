@@ -2,12 +2,13 @@
 """
 Quick script to make a user admin for testing purposes
 """
+
 import os
 import sys
 
 sys.path.append(os.getcwd())
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -22,7 +23,11 @@ def make_user_admin(username: str):
     """Make a user admin"""
     db = SessionLocal()
     try:
-        user = db.query(User).filter(User.username == username).first()
+        user = (
+            db.query(User)
+            .filter(func.lower(User.username) == func.lower(username))
+            .first()
+        )
         if user:
             user.role = "admin"
             db.commit()
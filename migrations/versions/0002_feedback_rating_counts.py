@@ -0,0 +1,39 @@
+"""Per-rating feedback counters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Creates a row for every rating, so feedback writes only ever UPDATE a
+counter, and backfills the totals from the existing feedback rows; a
+counting scan of feedback, run once.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    counts = op.create_table(
+        "feedback_rating_counts",
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("rating"),
+    )
+    op.bulk_insert(counts, [{"rating": rating, "total": 0} for rating in range(1, 6)])
+    op.execute(
+        "UPDATE feedback_rating_counts SET total = ("
+        "SELECT COUNT(*) FROM feedback "
+        "WHERE feedback.rating = feedback_rating_counts.rating)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feedback_rating_counts")
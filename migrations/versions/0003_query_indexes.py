@@ -0,0 +1,64 @@
+"""Indexes for keyset pagination, admin filters and case-insensitive lookups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY outside
+the migration transaction, so users and feedback stay writable while they
+build. A concurrent build that fails leaves an INVALID index behind; drop
+it and rerun the upgrade. The unique lower() indexes fail if existing rows
+differ only by case, and those rows must be merged first. They replace the
+case-sensitive unique indexes on username and email, which are dropped
+once the lower() indexes exist.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_users_created_at_id", "users", ["created_at", "id"], False),
+    ("ix_users_username_lower", "users", [sa.text("lower(username)")], True),
+    ("ix_users_email_lower", "users", [sa.text("lower(email)")], True),
+    ("ix_feedback_created_at_id", "feedback", ["created_at", "id"], False),
+    (
+        "ix_feedback_user_id_created_at",
+        "feedback",
+        ["user_id", "created_at", "id"],
+        False,
+    ),
+    ("ix_feedback_rating_id", "feedback", ["rating", "id"], False),
+]
+
+# Case-sensitive indexes made redundant by the lower() ones
+SUPERSEDED = [
+    ("ix_users_username", "users", ["username"]),
+    ("ix_users_email", "users", ["email"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name, table, columns, unique=unique, postgresql_concurrently=True
+            )
+        for name, table, _ in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            op.create_index(
+                name, table, columns, unique=True, postgresql_concurrently=True
+            )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Recompute the feedback summary counters from the feedback table.
+
+Run once after deploying the counters on a database that already has
+feedback, and whenever the counters need to be reconciled.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.feedback.service import FeedbackService
+
+
+async def rebuild_feedback_summary():
+    """Rebuild the per-rating counters and print the resulting summary"""
+    async with AsyncSessionLocal() as db:
+        summary = await FeedbackService.rebuild_feedback_summary(db)
+    await async_engine.dispose()
+    print(
+        f"Feedback summary rebuilt: {summary.total_feedback} entries, "
+        f"average rating {summary.average_rating}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_feedback_summary())
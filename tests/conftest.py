@@ -2,11 +2,15 @@ import asyncio
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.cache import clear_caches
 from app.core.database import Base, get_db
+from app.core.metrics import registry as metrics_registry
+from app.core.queries import instrument_engine
 from app.main import app
 
 # Create test database
@@ -18,6 +22,16 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+instrument_engine(async_engine)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -27,12 +41,9 @@ def event_loop():
     loop.close()
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_db():
+    async with AsyncTestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -40,6 +51,8 @@ def setup_test_db():
     """Create test database tables for each test"""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    clear_caches()
+    metrics_registry.clear()
     app.dependency_overrides[get_db] = override_get_db
     yield
     app.dependency_overrides.clear()
@@ -116,16 +129,28 @@ def authenticated_admin():
         finally:
             db.close()
 
-        async with client as c:
-            # Login and get token
-            login_response = await c.post(
-                "/auth/login",
-                json={
-                    "username": test_admin_data["username"],
-                    "password": test_admin_data["password"],
-                },
-            )
-            token = login_response.json()["access_token"]
-            return {"Authorization": f"Bearer {token}"}
+        # Login and get token (client is already open)
+        login_response = await client.post(
+            "/auth/login",
+            json={
+                "username": test_admin_data["username"],
+                "password": test_admin_data["password"],
+            },
+        )
+        token = login_response.json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
 
     return _create_authenticated_admin
+
+
+@pytest.fixture
+def sql_statements():
+    """Collect the SQL statements executed against the test database"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
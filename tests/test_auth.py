@@ -125,3 +125,266 @@ class TestAuthModule:
             # Empty body
             response3 = await c.post("/auth/login", json={})
             assert response3.status_code == 422
+
+
+class TestSignupUniqueness:
+    """Test that signup relies on the unique indexes"""
+
+    @pytest.mark.asyncio
+    async def test_signup_is_a_single_insert(self, client, sql_statements):
+        """Test that a signup issues one INSERT and no lookups"""
+        async with client as c:
+            sql_statements.clear()
+            response = await c.post(
+                "/auth/signup",
+                json={
+                    "username": "single",
+                    "email": "single@example.com",
+                    "password": "password123",
+                },
+            )
+
+        assert response.status_code == 201
+        assert len(sql_statements) == 1
+        assert sql_statements[0].startswith("INSERT INTO users")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_messages(self, client):
+        """Test that each collision reports the field that is taken"""
+        user_data = {
+            "username": "taken",
+            "email": "taken@example.com",
+            "password": "password123",
+        }
+
+        async with client as c:
+            assert (await c.post("/auth/signup", json=user_data)).status_code == 201
+
+            response = await c.post(
+                "/auth/signup", json={**user_data, "email": "other@example.com"}
+            )
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Username already registered"
+
+            response = await c.post(
+                "/auth/signup", json={**user_data, "username": "other"}
+            )
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Email already registered"
+
+            # The failed attempts leave the session usable
+            response = await c.post(
+                "/auth/signup",
+                json={**user_data, "username": "other", "email": "o@example.com"},
+            )
+            assert response.status_code == 201
+
+
+class TestCaseInsensitiveUsers:
+    """Test that usernames and emails ignore case"""
+
+    @pytest.mark.asyncio
+    async def test_login_ignores_username_case(self, client, test_user_data):
+        """Test login with a differently cased username"""
+        async with client as c:
+            await c.post("/auth/signup", json=test_user_data)
+            response = await c.post(
+                "/auth/login",
+                json={
+                    "username": test_user_data["username"].upper(),
+                    "password": test_user_data["password"],
+                },
+            )
+            assert response.status_code == 200
+
+            profile = await c.get(
+                "/user/profile",
+                headers={"Authorization": f"Bearer {response.json()['access_token']}"},
+            )
+            assert profile.json()["username"] == test_user_data["username"]
+
+    @pytest.mark.asyncio
+    async def test_signup_rejects_case_variants(self, client):
+        """Test that case variants of a taken username or email are rejected"""
+        async with client as c:
+            await c.post(
+                "/auth/signup",
+                json={
+                    "username": "Casey",
+                    "email": "Casey@Example.com",
+                    "password": "password123",
+                },
+            )
+
+            response = await c.post(
+                "/auth/signup",
+                json={
+                    "username": "casey",
+                    "email": "other@example.com",
+                    "password": "password123",
+                },
+            )
+            assert response.json()["detail"] == "Username already registered"
+
+            response = await c.post(
+                "/auth/signup",
+                json={
+                    "username": "other",
+                    "email": "casey@example.com",
+                    "password": "password123",
+                },
+            )
+            assert response.json()["detail"] == "Email already registered"
+
+
+class TestRefreshTokens:
+    """Test refresh token rotation and revocation"""
+
+    async def _login(self, c, test_user_data):
+        await c.post("/auth/signup", json=test_user_data)
+        response = await c.post(
+            "/auth/login",
+            json={
+                "username": test_user_data["username"],
+                "password": test_user_data["password"],
+            },
+        )
+        return response.json()
+
+    @pytest.mark.asyncio
+    async def test_login_returns_refresh_token(self, client, test_user_data):
+        """Test that login issues a refresh token stored only as a digest"""
+        from sqlalchemy import select
+
+        from app.auth.model import RefreshToken
+        from tests.conftest import TestingSessionLocal
+
+        async with client as c:
+            tokens = await self._login(c, test_user_data)
+            assert tokens["refresh_token"]
+            assert tokens["expires_in"] > 0
+
+        db = TestingSessionLocal()
+        try:
+            stored = db.scalars(select(RefreshToken.token_hash)).all()
+        finally:
+            db.close()
+        assert len(stored) == 1
+        assert stored[0] != tokens["refresh_token"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_tokens(self, client, test_user_data, monkeypatch):
+        """Test that a refresh issues new tokens without verifying a password"""
+        from app.auth import service
+
+        async def fail(*args):
+            raise AssertionError("refresh must not verify a password")
+
+        async with client as c:
+            tokens = await self._login(c, test_user_data)
+            monkeypatch.setattr(service, "verify_password", fail)
+
+            response = await c.post(
+                "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+            )
+            assert response.status_code == 200
+            renewed = response.json()
+            assert renewed["refresh_token"] != tokens["refresh_token"]
+
+            profile = await c.get(
+                "/user/profile",
+                headers={"Authorization": f"Bearer {renewed['access_token']}"},
+            )
+            assert profile.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_reuse_revokes_session(self, client, test_user_data):
+        """Test that replaying a rotated refresh token ends the session"""
+        async with client as c:
+            tokens = await self._login(c, test_user_data)
+            renewed = (
+                await c.post(
+                    "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+                )
+            ).json()
+
+            replay = await c.post(
+                "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+            )
+            assert replay.status_code == 401
+
+            # The legitimate successor is revoked along with its access token
+            response = await c.post(
+                "/auth/refresh", json={"refresh_token": renewed["refresh_token"]}
+            )
+            assert response.status_code == 401
+            profile = await c.get(
+                "/user/profile",
+                headers={"Authorization": f"Bearer {renewed['access_token']}"},
+            )
+            assert profile.status_code == 401
+            assert profile.json()["detail"] == "Token has been revoked"
+
+    @pytest.mark.asyncio
+    async def test_logout(self, client, test_user_data):
+        """Test that logout revokes the refresh token and its access token"""
+        async with client as c:
+            tokens = await self._login(c, test_user_data)
+            headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+            response = await c.post(
+                "/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+            )
+            assert response.status_code == 204
+
+            assert (await c.get("/user/profile", headers=headers)).status_code == 401
+            response = await c.post(
+                "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+            )
+            assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unknown_refresh_token(self, client):
+        """Test that an unknown refresh token is rejected"""
+        async with client as c:
+            response = await c.post("/auth/refresh", json={"refresh_token": "nope"})
+            assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_revocation_list_rebuild(self, client, test_user_data):
+        """Test that the revocation list is rebuilt from the table"""
+        from app.auth.revocation import revoked_tokens
+        from app.core.security import verify_token
+        from tests.conftest import AsyncTestingSessionLocal
+
+        async with client as c:
+            tokens = await self._login(c, test_user_data)
+            await c.post(
+                "/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+            )
+
+        jti = verify_token(tokens["access_token"])["jti"]
+        revoked_tokens.clear()
+        assert not revoked_tokens.is_revoked(jti)
+
+        async with AsyncTestingSessionLocal() as db:
+            await revoked_tokens.rebuild(db)
+        assert revoked_tokens.is_revoked(jti)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_keeps_concurrent_revocations(self):
+        """Test that a revocation made while the table is read survives the
+        rebuild that started before it"""
+        from app.auth.revocation import RevocationList
+
+        revocations = RevocationList()
+
+        class SnapshotSession:
+            async def scalars(self, statement):
+                # Committed after the snapshot was taken
+                revocations.add(["late"])
+                return ["early"]
+
+        await revocations.rebuild(SnapshotSession())
+        assert revocations.is_revoked("early")
+        assert revocations.is_revoked("late")
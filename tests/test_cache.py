@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.cache import RefreshingValue, TTLCache
+
+
+class TestTTLCache:
+    """Test the bounded LRU/TTL cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses"""
+        cache = TTLCache("test-counters", maxsize=10, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache never grows beyond maxsize"""
+        cache = TTLCache("test-lru", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_entries_expire(self):
+        """Test that entries are not served past their time-to-live"""
+        cache = TTLCache("test-ttl", maxsize=10, ttl=0.05)
+        cache.set("a", 1)
+        time.sleep(0.06)
+
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_invalidate(self):
+        """Test that invalidated entries are dropped"""
+        cache = TTLCache("test-invalidate", maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test that a maxsize of 0 disables the cache"""
+        cache = TTLCache("test-disabled", maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestRefreshingValue:
+    """Test the stale-while-revalidate value cache"""
+
+    @staticmethod
+    def _counting_loader(delay: float = 0.0):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            return len(calls)
+
+        return load, calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that concurrent misses run the loader only once"""
+        cache = RefreshingValue("test-single-flight", ttl=60, stale_ttl=60)
+        load, calls = self._counting_loader(delay=0.05)
+
+        results = await asyncio.gather(*[cache.get(load) for _ in range(10)])
+
+        assert results == [1] * 10
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        """Test that a stale value is returned and refreshed in the background"""
+        cache = RefreshingValue("test-stale", ttl=0.05, stale_ttl=60)
+        load, calls = self._counting_loader()
+
+        assert await cache.get(load) == 1
+        await asyncio.sleep(0.06)
+        assert await cache.get(load) == 1
+        await asyncio.sleep(0.01)
+        assert await cache.get(load) == 2
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_forces_reload(self):
+        """Test that a cleared value is loaded again on the next call"""
+        cache = RefreshingValue("test-clear", ttl=60, stale_ttl=60)
+        load, calls = self._counting_loader()
+
+        await cache.get(load)
+        cache.clear()
+        assert await cache.get(load) == 2
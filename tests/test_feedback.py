@@ -173,3 +173,396 @@ class TestFeedbackModule:
             )
             summary_data = summary_response.json()
             assert summary_data["total_feedback"] >= len(feedback_list)
+
+
+class TestFeedbackSummaryCounters:
+    """Test the incrementally maintained feedback summary"""
+
+    @pytest.mark.asyncio
+    async def test_summary_tracks_new_feedback(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that each submission is reflected in the summary"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            for rating in [5, 4, 4, 1]:
+                await c.post("/feedback", json={"rating": rating}, headers=headers)
+
+            response = await c.get("/feedback/summary")
+            assert response.status_code == 200
+            assert response.json() == {"total_feedback": 4, "average_rating": 3.5}
+
+    @pytest.mark.asyncio
+    async def test_first_feedback_for_a_rating_only_updates(
+        self, client, authenticated_user, test_user_data, sql_statements
+    ):
+        """Test that counter rows exist up front, so writers never race to
+        insert one"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            sql_statements.clear()
+            response = await c.post("/feedback", json={"rating": 2}, headers=headers)
+            assert response.status_code == 201
+
+        counter_writes = [s for s in sql_statements if "feedback_rating_counts" in s]
+        assert len(counter_writes) == 1
+        assert counter_writes[0].startswith("UPDATE")
+
+    @pytest.mark.asyncio
+    async def test_rebuild_reconciles_counters(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that the rebuild recomputes counters from the feedback table"""
+        from app.feedback.model import FeedbackRatingCount
+        from app.feedback.service import FeedbackService
+        from tests.conftest import AsyncTestingSessionLocal, TestingSessionLocal
+
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            for rating in [2, 3]:
+                await c.post("/feedback", json={"rating": rating}, headers=headers)
+
+        db = TestingSessionLocal()
+        db.query(FeedbackRatingCount).delete()
+        db.commit()
+        db.close()
+
+        async with AsyncTestingSessionLocal() as session:
+            summary = await FeedbackService.rebuild_feedback_summary(session)
+        assert summary.total_feedback == 2
+        assert summary.average_rating == 2.5
+
+    @pytest.mark.asyncio
+    async def test_summary_supports_conditional_requests(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that the summary carries caching headers and answers 304s"""
+        from app.feedback.cache import summary_cache
+
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            await c.post("/feedback", json={"rating": 3}, headers=headers)
+
+            response = await c.get("/feedback/summary")
+            etag = response.headers["etag"]
+            assert "max-age" in response.headers["cache-control"]
+
+            response = await c.get("/feedback/summary", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            for if_none_match in (f'"other", W/{etag}', "*"):
+                response = await c.get(
+                    "/feedback/summary", headers={"If-None-Match": if_none_match}
+                )
+                assert response.status_code == 304
+            for if_none_match in (f'"x{etag[1:]}', f"junk{etag}", etag[1:-1]):
+                response = await c.get(
+                    "/feedback/summary", headers={"If-None-Match": if_none_match}
+                )
+                assert response.status_code == 200
+
+            # Writes leave the cached summary in place until its TTL runs out
+            await c.post("/feedback", json={"rating": 5}, headers=headers)
+            response = await c.get("/feedback/summary", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+            summary_cache.clear()  # as if its TTL had run out
+            response = await c.get("/feedback/summary", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["total_feedback"] == 2
+
+
+class TestFeedbackPagination:
+    """Test cursor-based pagination of the admin feedback listing"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_cover_all_rows_once(
+        self,
+        client,
+        authenticated_user,
+        authenticated_admin,
+        test_user_data,
+        test_admin_data,
+    ):
+        """Test that following X-Next-Cursor visits every row exactly once"""
+        async with client as c:
+            user_headers = await authenticated_user(c, test_user_data)
+            admin_headers = await authenticated_admin(c, test_admin_data)
+            for rating in [1, 2, 3, 4, 5]:
+                await c.post("/feedback", json={"rating": rating}, headers=user_headers)
+
+            seen, cursor = [], None
+            while True:
+                params = {"limit": 2}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await c.get(
+                    "/admin/feedback", params=params, headers=admin_headers
+                )
+                assert response.status_code == 200
+                seen += [item["rating"] for item in response.json()]
+                cursor = response.headers.get("x-next-cursor")
+                if cursor is None:
+                    break
+
+            assert seen == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(
+        self, client, authenticated_admin, test_admin_data
+    ):
+        """Test that a malformed cursor returns 400"""
+        async with client as c:
+            headers = await authenticated_admin(c, test_admin_data)
+            response = await c.get(
+                "/admin/feedback", params={"cursor": "not-a-cursor"}, headers=headers
+            )
+            assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_filters_and_sort(
+        self,
+        client,
+        authenticated_user,
+        authenticated_admin,
+        test_user_data,
+        test_admin_data,
+    ):
+        """Test server-side rating/comment filters and descending rating sort"""
+        async with client as c:
+            user_headers = await authenticated_user(c, test_user_data)
+            admin_headers = await authenticated_admin(c, test_admin_data)
+            for rating, comment in [(1, "bad"), (4, None), (5, "great"), (3, "ok")]:
+                await c.post(
+                    "/feedback",
+                    json={"rating": rating, "comment": comment},
+                    headers=user_headers,
+                )
+
+            response = await c.get(
+                "/admin/feedback",
+                params={"min_rating": 3, "has_comment": True, "sort": "-rating"},
+                headers=admin_headers,
+            )
+            assert response.status_code == 200
+            assert [item["rating"] for item in response.json()] == [5, 3]
+
+            response = await c.get(
+                "/admin/feedback", params={"max_rating": 6}, headers=admin_headers
+            )
+            assert response.status_code == 422
+
+
+class TestFeedbackExport:
+    """Test the streaming feedback export"""
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson_and_csv(
+        self,
+        client,
+        authenticated_user,
+        authenticated_admin,
+        test_user_data,
+        test_admin_data,
+    ):
+        """Test that every row is exported in both formats"""
+        import csv
+        import io
+        import json
+
+        async with client as c:
+            user_headers = await authenticated_user(c, test_user_data)
+            admin_headers = await authenticated_admin(c, test_admin_data)
+            for rating in [2, 4]:
+                await c.post(
+                    "/feedback",
+                    json={"rating": rating, "comment": 'a, "quoted" comment'},
+                    headers=user_headers,
+                )
+
+            response = await c.get("/admin/feedback/export", headers=admin_headers)
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            rows = [json.loads(line) for line in response.text.splitlines()]
+            assert [row["rating"] for row in rows] == [2, 4]
+            assert rows[0]["username"] == test_user_data["username"]
+
+            response = await c.get(
+                "/admin/feedback/export",
+                params={"format": "csv", "created_after": "2000-01-01T00:00:00"},
+                headers=admin_headers,
+            )
+            assert response.status_code == 200
+            rows = list(csv.DictReader(io.StringIO(response.text)))
+            assert [row["rating"] for row in rows] == ["2", "4"]
+            assert rows[0]["comment"] == 'a, "quoted" comment'
+
+    @pytest.mark.asyncio
+    async def test_export_admin_only(self, client, authenticated_user, test_user_data):
+        """Test that regular users cannot export feedback"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            response = await c.get("/admin/feedback/export", headers=headers)
+            assert response.status_code == 403
+
+
+class TestFeedbackBatch:
+    """Test bulk feedback submission"""
+
+    @pytest.mark.asyncio
+    async def test_batch_creates_all_items_in_order(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that a batch returns one result per item, in request order"""
+        items = [{"rating": 5, "comment": "first"}, {"rating": 1}, {"rating": 3}]
+
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            response = await c.post("/feedback/batch", json=items, headers=headers)
+
+            assert response.status_code == 201
+            data = response.json()
+            assert [item["rating"] for item in data] == [5, 1, 3]
+            assert data[0]["comment"] == "first"
+            assert all("id" in item and "created_at" in item for item in data)
+
+            summary = (await c.get("/feedback/summary")).json()
+            assert summary == {"total_feedback": 3, "average_rating": 3.0}
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_if_any_item_invalid(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that one invalid item rejects the whole batch"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            response = await c.post(
+                "/feedback/batch", json=[{"rating": 4}, {"rating": 7}], headers=headers
+            )
+            assert response.status_code == 422
+
+            summary = (await c.get("/feedback/summary")).json()
+            assert summary["total_feedback"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self, client, authenticated_user, test_user_data):
+        """Test that empty and oversized batches fail validation"""
+        from app.core.config import settings
+
+        oversized = [{"rating": 4}] * (settings.FEEDBACK_BATCH_MAX_ITEMS + 1)
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            for items in ([], oversized):
+                response = await c.post("/feedback/batch", json=items, headers=headers)
+                assert response.status_code == 422
+
+
+class TestFeedbackWriteBehind:
+    """Test queued feedback ingestion with batched commits"""
+
+    @pytest.mark.asyncio
+    async def test_queued_feedback_is_written_on_drain(
+        self, client, authenticated_user, test_user_data, monkeypatch
+    ):
+        """Test that 202 receipts are returned and items land after draining"""
+        from app.core.config import settings
+        from app.feedback.writer import feedback_writer
+        from tests.conftest import AsyncTestingSessionLocal
+
+        monkeypatch.setattr(settings, "FEEDBACK_WRITE_BEHIND", True)
+        monkeypatch.setattr(
+            feedback_writer, "session_factory", AsyncTestingSessionLocal
+        )
+        feedback_writer.start()
+        async with client as c:
+            try:
+                headers = await authenticated_user(c, test_user_data)
+                receipts = []
+                for rating in [5, 3, 4]:
+                    response = await c.post(
+                        "/feedback", json={"rating": rating}, headers=headers
+                    )
+                    assert response.status_code == 202
+                    receipts.append(response.json()["ingest_id"])
+                assert len(set(receipts)) == 3
+            finally:
+                await feedback_writer.stop()
+
+            summary = (await c.get("/feedback/summary")).json()
+            assert summary == {"total_feedback": 3, "average_rating": 4.0}
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        """Test that submissions beyond the queue size are refused with 503"""
+        from fastapi import HTTPException
+
+        from app.feedback.schemas import FeedbackCreate
+        from app.feedback.writer import FeedbackWriter
+        from tests.conftest import AsyncTestingSessionLocal
+
+        writer = FeedbackWriter(session_factory=AsyncTestingSessionLocal, max_queue=1)
+        with pytest.raises(HTTPException) as not_running:
+            writer.submit(FeedbackCreate(rating=5), user_id=1)
+        assert not_running.value.status_code == 503
+
+        writer.start()
+        try:
+            # The writer task cannot take the first item before it next
+            # runs, so the queue is full
+            writer.submit(FeedbackCreate(rating=5), user_id=1)
+            with pytest.raises(HTTPException) as full:
+                writer.submit(FeedbackCreate(rating=4), user_id=1)
+            assert full.value.status_code == 503
+        finally:
+            await writer.stop()
+        assert writer.written == 1
+        assert writer.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_rejected_item_does_not_drop_its_batch(self):
+        """Test that a row the database rejects is dropped on its own while
+        the rest of its batch is written"""
+        from app.feedback.schemas import FeedbackCreate
+        from app.feedback.writer import FeedbackWriter
+        from tests.conftest import AsyncTestingSessionLocal
+
+        writer = FeedbackWriter(
+            session_factory=AsyncTestingSessionLocal, batch_size=10, max_retries=0
+        )
+        writer.start()
+        for user_id in [1, None, 1, 1]:  # NULL user_id violates NOT NULL
+            writer.submit(FeedbackCreate(rating=5), user_id=user_id)
+        await writer.stop()
+
+        assert writer.written == 3
+        assert writer.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_drain_timeout_counts_in_flight_batch(self):
+        """Test that items being written when the drain times out are
+        counted as dropped along with those still queued"""
+        import asyncio
+        from contextlib import asynccontextmanager
+
+        from app.feedback.schemas import FeedbackCreate
+        from app.feedback.writer import FeedbackWriter
+
+        @asynccontextmanager
+        async def hanging_session():
+            await asyncio.Event().wait()
+            yield
+
+        writer = FeedbackWriter(
+            session_factory=hanging_session,
+            max_queue=1,
+            batch_size=1,
+            drain_timeout=0.1,
+        )
+        writer.start()
+        writer.submit(FeedbackCreate(rating=5), user_id=1)
+        await asyncio.sleep(0.01)  # the writer takes it and hangs writing it
+        writer.submit(FeedbackCreate(rating=4), user_id=1)
+
+        await writer.stop()
+        assert writer.dropped == 2
+        assert writer.written == 0
+        assert not writer.running
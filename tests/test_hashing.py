@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from app.core.hashing import HashingExecutor, HashingQueueFull
+
+
+class TestHashingExecutor:
+    """Test bcrypt hashing offloaded to the process pool"""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_round_trip(self):
+        """Test that hashes produced by the pool verify correctly"""
+        executor = HashingExecutor(pool_size=1, queue_depth=4)
+        try:
+            hashed = await executor.hash_password("secret123")
+            assert hashed != "secret123"
+            assert await executor.verify_password("secret123", hashed) is True
+            assert await executor.verify_password("wrong", hashed) is False
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_enforced(self):
+        """Test that jobs beyond the queue depth are rejected"""
+        executor = HashingExecutor(pool_size=1, queue_depth=1)
+        try:
+            first = asyncio.ensure_future(executor.hash_password("secret123"))
+            await asyncio.sleep(0)
+            with pytest.raises(HashingQueueFull):
+                await executor.hash_password("secret456")
+            await first
+            assert executor.pending == 0
+        finally:
+            executor.shutdown()
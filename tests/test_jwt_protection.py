@@ -34,3 +34,33 @@ class TestJWTProtectedRoutes:
             assert "username" in data
             assert "email" in data
             assert "id" in data
+
+
+class TestStatelessAuth:
+    """Test resolving the caller from token claims without a user lookup"""
+
+    @staticmethod
+    def _admin_headers():
+        from app.core.security import create_access_token
+
+        token = create_access_token(
+            data={"sub": "ghost-admin", "user_id": 999, "role": "admin"}
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    @pytest.mark.asyncio
+    async def test_claims_trusted_when_stateless(self, client, monkeypatch):
+        """Test that admin endpoints accept signed claims in stateless mode"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+        async with client as c:
+            response = await c.get("/admin/system/pool", headers=self._admin_headers())
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_user_row_required_by_default(self, client):
+        """Test that the user row is still checked when stateless mode is off"""
+        async with client as c:
+            response = await c.get("/admin/system/pool", headers=self._admin_headers())
+            assert response.status_code == 401
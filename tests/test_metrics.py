@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from app.core.metrics import Counter, Histogram, MetricsRegistry, registry
+
+
+class TestMetricsEndpoint:
+    """Test the Prometheus metrics endpoint"""
+
+    def test_route_template_is_the_matched_route(self):
+        """Test that a parameter equal to a literal segment is not confused
+        with it"""
+        from fastapi.routing import APIRoute
+
+        from app.core.middleware import route_template
+
+        route = APIRoute("/{kind}/items", endpoint=lambda kind: None)
+        scope = {"path": "/items/items", "path_params": {"kind": "items"}}
+        assert route_template({**scope, "route": route}) == "/{kind}/items"
+        prefixed = {**scope, "path": "/api/items/items", "route": route}
+        assert route_template(prefixed) == "/api/{kind}/items"
+        assert route_template(scope) == "unmatched"
+
+    @pytest.mark.asyncio
+    async def test_request_metrics_by_route_template(
+        self, client, authenticated_admin, test_admin_data
+    ):
+        """Test that requests are counted per route template, not raw path"""
+        async with client as c:
+            headers = await authenticated_admin(c, test_admin_data)
+            await c.patch(
+                "/user/users/1", json={"email": "root@example.com"}, headers=headers
+            )
+            await c.get("/no/such/path")
+            response = await c.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert (
+            'http_requests_total{method="PATCH",route="/user/users/{user_id}",'
+            'status="200"} 1.0' in body
+        )
+        assert 'route="unmatched",status="404"' in body
+        assert (
+            'http_request_duration_seconds_count{method="POST",route="/auth/login"} 1'
+            in body
+        )
+        assert 'http_request_duration_seconds_bucket{method="GET"' in body
+        assert "http_requests_in_progress 1.0" in body  # the /metrics request
+
+    @pytest.mark.asyncio
+    async def test_auth_pool_and_cache_metrics(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that bcrypt, JWT, pool and cache metrics are exported"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            await c.get("/user/profile", headers=headers)
+            body = (await c.get("/metrics")).text
+
+        assert 'password_hash_duration_seconds_count{operation="hash"} 1' in body
+        assert 'password_hash_duration_seconds_count{operation="verify"} 1' in body
+        assert "jwt_decode_duration_seconds_count 1" in body
+        assert "db_pool_checkouts_total" in body
+        assert 'cache_misses_total{cache="users"}' in body
+
+
+class TestMetricsAggregation:
+    """Test summing the snapshots published by several workers"""
+
+    def test_render_sums_worker_snapshots(self, tmp_path):
+        """Test that counters and histograms of every worker are added up"""
+        local = MetricsRegistry()
+        requests = Counter("jobs_total", "Jobs", ["kind"])
+        latency = Histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+        # Metrics register with the global registry; move them to this one
+        for metric in (requests, latency):
+            del registry.metrics[metric.name]
+            local.register(metric)
+
+        requests.inc(kind="a")
+        latency.observe(0.05)
+
+        other_worker = MetricsRegistry()
+        other_worker.metrics = dict(local.metrics)
+        snapshot = other_worker.snapshot()
+        with open(os.path.join(tmp_path, "999999.json"), "w") as f:
+            json.dump(snapshot, f)
+
+        requests.inc(kind="a")
+        latency.observe(0.5)
+        body = local.render(str(tmp_path))
+
+        assert 'jobs_total{kind="a"} 3.0' in body
+        assert 'job_seconds_bucket{le="0.1"} 2' in body
+        assert 'job_seconds_bucket{le="1.0"} 3' in body
+        assert 'job_seconds_bucket{le="+Inf"} 3' in body
+        assert "job_seconds_count 3" in body
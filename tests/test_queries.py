@@ -0,0 +1,83 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.queries import QueryStats, parameter_shape, query_stats
+
+from .conftest import AsyncTestingSessionLocal
+
+
+class TestQueryInstrumentation:
+    """Test per-request query counting and slow-query logging"""
+
+    @pytest.mark.asyncio
+    async def test_stats_follow_the_calling_context(self):
+        """Test that statements run through the greenlet bridge are attributed"""
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            async with AsyncTestingSessionLocal() as db:
+                await db.execute(text("SELECT 1"))
+                await db.execute(text("SELECT 2"))
+        finally:
+            query_stats.reset(token)
+
+        assert stats.count == 2
+        assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_leaves_no_state_on_connection(self):
+        """Test that a statement that raises neither leaks its start time
+        nor skews the timing of the statements after it"""
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            async with AsyncTestingSessionLocal() as db:
+                with pytest.raises(DBAPIError):
+                    await db.execute(text("SELECT * FROM no_such_table"))
+                await db.rollback()
+                await db.execute(text("SELECT 1"))
+                connection = await db.connection()
+                info = dict(connection.info)
+        finally:
+            query_stats.reset(token)
+
+        assert stats.count == 1
+        assert stats.slowest_statement == "SELECT 1"
+        assert "query_start" not in info
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that responses report the request's query count and DB time"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            response = await c.get("/user/profile", headers=headers)
+
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="1 queries"' in timing
+        assert "app;dur=" in timing
+
+    @pytest.mark.asyncio
+    async def test_slow_query_logs_shape_not_values(self, monkeypatch, caplog):
+        """Test that slow statements are logged with parameter types only"""
+        monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+        with caplog.at_level(logging.WARNING, logger="app.core.queries"):
+            async with AsyncTestingSessionLocal() as db:
+                await db.execute(text("SELECT :secret"), {"secret": "hunter2"})
+
+        assert "Slow query" in caplog.text
+        assert "parameters (str)" in caplog.text
+        assert "hunter2" not in caplog.text
+
+    def test_parameter_shape(self):
+        """Test the parameter descriptions for each paramstyle"""
+        assert parameter_shape({"a": 1, "b": None}) == "{a: int, b: NoneType}"
+        assert parameter_shape((1, "x")) == "(int, str)"
+        assert parameter_shape([{"a": 1}, {"a": 2}]) == "2 x {a: int}"
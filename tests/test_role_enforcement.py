@@ -0,0 +1,67 @@
+import pytest
+
+
+class TestRoleEnforcement:
+    """Test that role changes take effect for already issued tokens"""
+
+    @pytest.mark.asyncio
+    async def test_promotion_applies_immediately(
+        self,
+        client,
+        authenticated_user,
+        authenticated_admin,
+        test_user_data,
+        test_admin_data,
+    ):
+        """Test that a promoted user gains admin access without re-login"""
+        async with client as c:
+            user_headers = await authenticated_user(c, test_user_data)
+            admin_headers = await authenticated_admin(c, test_admin_data)
+
+            response = await c.get("/admin/feedback", headers=user_headers)
+            assert response.status_code == 403
+
+            profile = await c.get("/user/profile", headers=user_headers)
+            user_id = profile.json()["id"]
+            response = await c.patch(
+                f"/admin/roles/{user_id}", json={"role": "admin"}, headers=admin_headers
+            )
+            assert response.status_code == 200
+
+            response = await c.get("/admin/feedback", headers=user_headers)
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_deactivation_applies_immediately(
+        self,
+        client,
+        authenticated_user,
+        authenticated_admin,
+        test_user_data,
+        test_admin_data,
+    ):
+        """Test that a deactivated user is rejected without waiting for expiry"""
+        async with client as c:
+            user_headers = await authenticated_user(c, test_user_data)
+            admin_headers = await authenticated_admin(c, test_admin_data)
+
+            response = await c.post(
+                "/feedback", json={"rating": 5}, headers=user_headers
+            )
+            assert response.status_code == 201
+
+            profile = await c.get("/user/profile", headers=user_headers)
+            user_id = profile.json()["id"]
+            response = await c.patch(
+                f"/user/users/{user_id}",
+                json={"is_active": False},
+                headers=admin_headers,
+            )
+            assert response.status_code == 200
+
+            response = await c.post(
+                "/feedback", json={"rating": 5}, headers=user_headers
+            )
+            assert response.status_code == 400
+            response = await c.get("/user/profile", headers=user_headers)
+            assert response.status_code == 400
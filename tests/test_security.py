@@ -0,0 +1,142 @@
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from app.core.config import settings
+from app.core.keys import get_key_set
+from app.core.security import create_access_token, token_cache, verify_token
+from generate_signing_key import generate_key, retire_key
+
+
+class TestTokenVerificationCache:
+    """Test caching of decoded JWT payloads"""
+
+    def test_repeated_verification_hits_cache(self):
+        """Test that a reused token is served from the cache"""
+        token = create_access_token(data={"sub": "alice", "user_id": 1})
+        hits = token_cache.hits
+
+        first = verify_token(token)
+        second = verify_token(token)
+
+        assert first == second
+        assert first["sub"] == "alice"
+        assert token_cache.hits == hits + 1
+
+    def test_invalid_token_is_not_cached(self):
+        """Test that tokens failing verification are never cached"""
+        size = len(token_cache)
+        assert verify_token("not-a-token") is None
+        assert len(token_cache) == size
+
+    def test_expired_token_is_rejected(self):
+        """Test that cached payloads are not served past their exp claim"""
+        token = create_access_token(
+            data={"sub": "alice"}, expires_delta=timedelta(seconds=1)
+        )
+        payload = verify_token(token)
+        assert payload is not None
+
+        time.sleep(max(payload["exp"] - time.time(), 0) + 1.1)
+        assert verify_token(token) is None
+
+
+@pytest.fixture
+def key_dir(tmp_path, monkeypatch):
+    """Sign tokens with the keys in a temporary JWT_KEYS_DIR"""
+    monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+    get_key_set.cache_clear()
+    yield tmp_path
+    get_key_set.cache_clear()
+
+
+class TestAsymmetricSigning:
+    """Test RS256/ES256 signing with key ids and rotation"""
+
+    @pytest.mark.parametrize("key_type,algorithm", [("ec", "ES256"), ("rsa", "RS256")])
+    def test_token_carries_kid(self, key_dir, key_type, algorithm):
+        """Test that tokens are signed with the active key and name it"""
+        generate_key(str(key_dir / "k1.pem"), key_type)
+        token = create_access_token(data={"sub": "alice"})
+
+        header = jwt.get_unverified_header(token)
+        assert header == {"alg": algorithm, "typ": "JWT", "kid": "k1"}
+        assert verify_token(token)["sub"] == "alice"
+
+    def test_rotation(self, key_dir):
+        """Test that tokens of a retired key verify until it is removed"""
+        generate_key(str(key_dir / "old.pem"), "ec")
+        old_token = create_access_token(data={"sub": "alice"})
+
+        generate_key(str(key_dir / "new.pem"), "rsa")
+        retire_key(str(key_dir / "old.pem"))
+        get_key_set.cache_clear()
+        new_token = create_access_token(data={"sub": "bob"})
+
+        assert jwt.get_unverified_header(new_token)["kid"] == "new"
+        assert verify_token(old_token)["sub"] == "alice"
+        assert verify_token(new_token)["sub"] == "bob"
+
+        (key_dir / "old.pem").unlink()
+        get_key_set.cache_clear()
+        token_cache.clear()
+        assert verify_token(old_token) is None
+
+    def test_active_kid_required_with_several_private_keys(self, key_dir, monkeypatch):
+        """Test that the signing key must be chosen when several could sign"""
+        generate_key(str(key_dir / "a.pem"), "ec")
+        generate_key(str(key_dir / "b.pem"), "ec")
+        with pytest.raises(ValueError):
+            get_key_set()
+
+        monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "b")
+        get_key_set.cache_clear()
+        token = create_access_token(data={"sub": "alice"})
+        assert jwt.get_unverified_header(token)["kid"] == "b"
+
+    def test_shared_secret_tokens_rejected(self, key_dir):
+        """Test that HS256 tokens are not accepted once keys are configured"""
+        token = jwt.encode(
+            {"sub": "mallory", "exp": time.time() + 60},
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+        generate_key(str(key_dir / "k1.pem"), "ec")
+        assert verify_token(token) is None
+
+    @pytest.mark.asyncio
+    async def test_jwks(self, key_dir, client):
+        """Test that the JWKS publishes every public key, cacheably"""
+        generate_key(str(key_dir / "k1.pem"), "ec")
+        generate_key(str(key_dir / "k2.pem"), "rsa")
+        retire_key(str(key_dir / "k2.pem"))
+        token = create_access_token(data={"sub": "alice"})
+
+        async with client as c:
+            response = await c.get("/.well-known/jwks.json")
+            assert response.status_code == 200
+            assert "max-age=" in response.headers["cache-control"]
+            keys = {key["kid"]: key for key in response.json()["keys"]}
+            assert set(keys) == {"k1", "k2"}
+            assert keys["k1"]["alg"] == "ES256"
+            assert "d" not in keys["k1"]  # never the private part
+            assert keys["k2"]["kty"] == "RSA"
+
+            # A downstream service validates tokens with the JWKS alone
+            claims = jwt.decode(token, keys["k1"], algorithms=["ES256"])
+            assert claims["sub"] == "alice"
+
+            cached = await c.get(
+                "/.well-known/jwks.json",
+                headers={"If-None-Match": response.headers["etag"]},
+            )
+            assert cached.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_jwks_empty_with_shared_secret(self, client):
+        """Test that the shared secret is never published"""
+        async with client as c:
+            response = await c.get("/.well-known/jwks.json")
+            assert response.json() == {"keys": []}
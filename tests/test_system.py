@@ -0,0 +1,185 @@
+import pytest
+
+
+class TestSystemModule:
+    """Test operational endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_pool_status_admin_only(
+        self, client, authenticated_user, test_user_data
+    ):
+        """Test that regular users cannot read pool statistics"""
+        async with client as c:
+            headers = await authenticated_user(c, test_user_data)
+            response = await c.get("/admin/system/pool", headers=headers)
+            assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_pool_status(self, client, authenticated_admin, test_admin_data):
+        """Test that admins can read pool occupancy and wait times"""
+        async with client as c:
+            headers = await authenticated_admin(c, test_admin_data)
+            response = await c.get("/admin/system/pool", headers=headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["timeouts"] == 0
+            assert "checked_out" in data
+            assert "wait_seconds_avg" in data
+            assert "overflow_peak" in data
+
+    @pytest.mark.asyncio
+    async def test_pool_wait_counts_only_the_queue(self):
+        """Test that checkout work after a connection is handed out, such as
+        a pre-ping, is not reported as waiting for the pool"""
+        import time
+
+        from sqlalchemy import event, exc
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from app.core.pool import InstrumentedQueuePool, pool_stats
+
+        engine = create_async_engine(
+            "sqlite+aiosqlite://",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        # Stands in for a slow pre-ping, which runs at the same point
+        event.listen(engine.sync_engine.pool, "checkout", lambda *args: time.sleep(0.1))
+        pool_stats.reset()
+        try:
+            async with engine.connect():
+                assert pool_stats.checkouts == 1
+                assert pool_stats.wait_seconds_total < 0.1
+
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            assert pool_stats.timeouts == 1
+            assert pool_stats.wait_seconds_max >= 0.05
+        finally:
+            await engine.dispose()
+            pool_stats.reset()
+
+    @pytest.mark.asyncio
+    async def test_cache_stats(self, client, authenticated_admin, test_admin_data):
+        """Test that cache counters are reported per cache"""
+        async with client as c:
+            headers = await authenticated_admin(c, test_admin_data)
+            response = await c.get("/admin/system/caches", headers=headers)
+            assert response.status_code == 200
+            users = next(s for s in response.json() if s["name"] == "users")
+            assert users["misses"] >= 1
+            assert "evictions" in users
+
+
+class TestReadiness:
+    """Test the /ready probe"""
+
+    @pytest.fixture(autouse=True)
+    def probe_test_database(self, monkeypatch):
+        """Probe the test database instead of the configured one"""
+        from app.system import service
+        from tests.conftest import async_engine
+
+        monkeypatch.setattr(service, "async_engine", async_engine)
+
+    @pytest.mark.asyncio
+    async def test_ready(self, client):
+        """Test that a reachable database with pool headroom is ready"""
+        async with client as c:
+            response = await c.get("/ready")
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "ready"
+            assert data["problems"] == []
+            assert data["database_latency_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_pool_exhausted(self, client, monkeypatch):
+        """Test that a saturated pool reports degraded without probing"""
+        from app.system import service
+
+        async def ping(engine):
+            raise AssertionError("probe should be skipped")
+
+        monkeypatch.setattr(
+            service,
+            "get_pool_status",
+            lambda pool: {
+                "size": 5,
+                "max_overflow": 2,
+                "checked_out": 7,
+                "timeouts": 0,
+            },
+        )
+        monkeypatch.setattr(service.SystemService, "_ping", staticmethod(ping))
+        async with client as c:
+            response = await c.get("/ready")
+            assert response.status_code == 503
+            data = response.json()
+            assert data["status"] == "degraded"
+            assert data["pool_in_use"] == 7
+            assert data["pool_capacity"] == 7
+            assert "connection pool exhausted" in data["problems"]
+
+    @pytest.mark.asyncio
+    async def test_unlimited_overflow_is_never_exhausted(self, client, monkeypatch):
+        """Test that a pool with unlimited overflow (max_overflow=-1) is not
+        reported exhausted once its base size is checked out"""
+        from app.system import service
+
+        monkeypatch.setattr(
+            service,
+            "get_pool_status",
+            lambda pool: {
+                "size": 5,
+                "max_overflow": -1,
+                "checked_out": 9,
+                "timeouts": 0,
+            },
+        )
+        async with client as c:
+            response = await c.get("/ready")
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "ready"
+            assert data["pool_in_use"] == 9
+            assert data["pool_capacity"] is None
+
+    @pytest.mark.asyncio
+    async def test_database_unreachable(self, client, monkeypatch):
+        """Test that a failing database round trip reports unavailable"""
+        from app.system import service
+
+        async def ping(engine):
+            raise ConnectionRefusedError()
+
+        monkeypatch.setattr(service.SystemService, "_ping", staticmethod(ping))
+        async with client as c:
+            response = await c.get("/ready")
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+            assert response.json()["status"] == "unavailable"
+
+    @pytest.mark.asyncio
+    async def test_probe_shared(self, client, monkeypatch):
+        """Test that concurrent polls share one probe and reuse its result"""
+        import asyncio
+
+        from app.system import service
+
+        probes = 0
+
+        async def ping(engine):
+            nonlocal probes
+            probes += 1
+            await asyncio.sleep(0.01)
+
+        monkeypatch.setattr(service.SystemService, "_ping", staticmethod(ping))
+        async with client as c:
+            responses = await asyncio.gather(*(c.get("/ready") for _ in range(10)))
+            responses.append(await c.get("/ready"))
+            assert all(r.status_code == 200 for r in responses)
+            assert probes == 1
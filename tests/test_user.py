@@ -0,0 +1,87 @@
+import pytest
+
+from app.role.schemas import RoleUpdate
+from app.role.service import RoleService
+from app.user.schemas import UserCreate, UserUpdate
+from app.user.service import UserService
+
+from .conftest import AsyncTestingSessionLocal
+
+
+class TestUserListing:
+    """Test the admin user listing"""
+
+    @pytest.mark.asyncio
+    async def test_users_paginate_with_cursor(
+        self, client, authenticated_admin, test_admin_data
+    ):
+        """Test that users can be paged with X-Next-Cursor"""
+        async with client as c:
+            headers = await authenticated_admin(c, test_admin_data)
+            for i in range(3):
+                await c.post(
+                    "/auth/signup",
+                    json={
+                        "username": f"user{i}",
+                        "email": f"user{i}@example.com",
+                        "password": "password123",
+                    },
+                )
+
+            first = await c.get("/user/users", params={"limit": 2}, headers=headers)
+            assert first.status_code == 200
+            assert len(first.json()) == 2
+            cursor = first.headers["x-next-cursor"]
+
+            second = await c.get(
+                "/user/users", params={"limit": 2, "cursor": cursor}, headers=headers
+            )
+            assert second.status_code == 200
+            assert "x-next-cursor" not in second.headers
+
+            usernames = [u["username"] for u in first.json() + second.json()]
+            assert usernames == ["admin", "user0", "user1", "user2"]
+
+
+class TestUserWrites:
+    """Test that user writes take a single round trip"""
+
+    @pytest.mark.asyncio
+    async def test_create_and_update_use_one_statement(self, sql_statements):
+        """Test that create, update and role change each issue one statement"""
+        async with AsyncTestingSessionLocal() as db:
+            sql_statements.clear()
+            user = await UserService.create_user(
+                db,
+                UserCreate(
+                    username="writer", email="writer@example.com", password="pw123"
+                ),
+            )
+            assert len(sql_statements) == 1
+            assert user.id is not None and user.created_at is not None
+
+            sql_statements.clear()
+            updated = await UserService.update_user(
+                db, user.id, UserUpdate(email="new@example.com")
+            )
+            assert len(sql_statements) == 1
+            assert updated.email == "new@example.com"
+            assert updated.updated_at is not None
+
+            sql_statements.clear()
+            promoted = await RoleService.update_user_role(
+                db, user.id, RoleUpdate(role="admin")
+            )
+            assert len(sql_statements) == 1
+            assert promoted.role == "admin"
+
+    @pytest.mark.asyncio
+    async def test_update_missing_user(self):
+        """Test that updating an unknown user returns None"""
+        async with AsyncTestingSessionLocal() as db:
+            assert (
+                await UserService.update_user(
+                    db, 999, UserUpdate(email="x@example.com")
+                )
+                is None
+            )